@@ -10,7 +10,7 @@ from modules.document_parser import DocumentParser
 from modules.supplier_manager import SupplierManager
 from modules.email_generator import EmailGenerator
 from modules.deadline_calculator import DeadlineCalculator
-from modules.order_tracker import OrderTracker
+from modules.order_tracker import OrderTracker, COUNTRY_DISPLAY_NAMES
 from modules.data_collector import DataCollector
 from modules.terms_conditions import TermsConditions
 
@@ -76,6 +76,95 @@ else:
 
 # Material categories
 MATERIAL_CATEGORIES = ["piping", "valves", "flanges", "fittings", "bolts", "gaskets", "finned tubes"]
+MATERIAL_CATEGORY_SET = frozenset(MATERIAL_CATEGORIES)
+
+def count_suppliers_by_category(suppliers_df):
+    """Count suppliers whose Material_Categories mention each material category."""
+    # Match categories against the distinct values only, weighted by how often each occurs
+    value_counts = suppliers_df['Material_Categories'].dropna().astype(str).str.lower().value_counts()
+    return {
+        category: int(sum(count for value, count in value_counts.items() if category in value))
+        for category in MATERIAL_CATEGORIES
+    }
+
+@st.cache_data(show_spinner=False)
+def build_category_index(suppliers_df):
+    """Map each material category to the set of companies whose Material_Categories mention it."""
+    companies_by_value = {}
+    materials = suppliers_df['Material_Categories'].fillna('').astype(str).str.lower()
+    for company_name, value in zip(suppliers_df['Company_Name'], materials):
+        companies_by_value.setdefault(value, set()).add(company_name)
+    
+    return {
+        category: frozenset().union(*(names for value, names in companies_by_value.items() if category in value))
+        for category in MATERIAL_CATEGORIES
+    }
+
+def metrics_row(metrics):
+    """Render (label, value, help) metrics side by side in a single row of columns."""
+    for col, (label, value, help_text) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value, help=help_text)
+
+def select_pending_order(table_key):
+    """Remember the Order_ID of the follow-up selected in the pending orders table."""
+    # Row positions refer to the table as it was rendered, whose IDs were stored alongside it
+    rows = st.session_state[table_key].selection.rows
+    order_ids = st.session_state.get('pending_order_ids', [])
+    st.session_state.selected_pending_order = order_ids[rows[0]] if rows and rows[0] < len(order_ids) else None
+
+@st.fragment
+def render_order_details(orders_df):
+    """Render the order details and status update form; selecting an order only reruns this fragment."""
+    # Index orders by ID for hash lookups of the selected order
+    orders_by_id = orders_df.drop_duplicates('Order_ID').set_index('Order_ID', drop=False)
+    selected_order = st.selectbox("Select Order for Details", orders_by_id.index.tolist())
+    if selected_order:
+        order_details = orders_by_id.loc[selected_order]
+        
+        with st.expander(f"📄 Order Details: {selected_order}", expanded=True):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write(f"**Project:** {order_details['Project_Name']}")
+                st.write(f"**Reference:** {order_details['Tender_Reference']}")
+                st.write(f"**Materials:** {order_details['Materials']}")
+                st.write(f"**Status:** {order_details['Status']}")
+            
+            with col2:
+                st.write(f"**Total Suppliers:** {order_details['Total_Suppliers']}")
+                st.write(f"**Emails Sent:** {order_details['Emails_Sent']}")
+                st.write(f"**Follow-up Date:** {order_details['Follow_Up_Date']}")
+                st.write(f"**Supplier Categories:** {order_details['Supplier_Categories']}")
+            
+            # Update status form
+            with st.form(f"update_status_{selected_order}"):
+                new_status = st.selectbox(
+                    "Update Status",
+                    ["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"],
+                    index=["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"].index(order_details['Status']) if order_details['Status'] in ["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"] else 0
+                )
+                
+                notes = st.text_area("Add Notes", value=order_details.get('Notes', ''))
+                
+                if st.form_submit_button("Update Order"):
+                    success = st.session_state.order_tracker.update_order_status(selected_order, new_status, notes)
+                    if success:
+                        st.success("✅ Order updated successfully!")
+                        
+                        # Log order tracking activity
+                        order_data = {
+                            'order_id': selected_order,
+                            'project_name': order_details['Project_Name'],
+                            'old_status': order_details['Status'],
+                            'new_status': new_status,
+                            'materials': order_details['Materials'],
+                            'total_suppliers': order_details['Total_Suppliers']
+                        }
+                        st.session_state.data_collector.log_order_tracking(order_data)
+                        
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to update order.")
 
 if page == "📄 Document Processing":
     st.header("Document Processing")
@@ -238,7 +327,10 @@ elif page == "🏢 Supplier Management":
                 ["All"] + MATERIAL_CATEGORIES
             )
         with col3:
-            search_term = st.text_input("Search Company Name")
+            # Only apply the search on submit instead of on every keystroke
+            with st.form("supplier_search", clear_on_submit=False):
+                search_term = st.text_input("Search Company Name")
+                st.form_submit_button("Apply")
         
         # Apply filters
         filtered_df = suppliers_df.copy()
@@ -359,7 +451,7 @@ elif page == "🏢 Supplier Management":
                     new_material_categories = st.multiselect(
                         "Material Categories*",
                         MATERIAL_CATEGORIES,
-                        default=[cat for cat in current_categories if cat in MATERIAL_CATEGORIES]
+                        default=[cat for cat in current_categories if cat in MATERIAL_CATEGORY_SET]
                     )
                     
                     col1, col2 = st.columns(2)
@@ -413,18 +505,14 @@ elif page == "🏢 Supplier Management":
         st.subheader("Supplier Database Statistics")
         
         if not suppliers_df.empty:
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Total Suppliers", len(suppliers_df))
-            with col2:
-                st.metric("Countries", suppliers_df['Country'].nunique())
-            with col3:
-                chinese_count = len(suppliers_df[suppliers_df['Country'] == 'China'])
-                st.metric("Chinese Suppliers", chinese_count)
-            with col4:
-                emirati_count = len(suppliers_df[suppliers_df['Country'] == 'UAE'])
-                st.metric("Emirati Suppliers", emirati_count)
+            chinese_count = int((suppliers_df['Country'] == 'China').sum())
+            emirati_count = int((suppliers_df['Country'] == 'UAE').sum())
+            metrics_row([
+                ("Total Suppliers", len(suppliers_df), None),
+                ("Countries", suppliers_df['Country'].nunique(), None),
+                ("Chinese Suppliers", chinese_count, None),
+                ("Emirati Suppliers", emirati_count, None)
+            ])
             
             # Regional distribution
             st.markdown("**Regional Distribution:**")
@@ -433,10 +521,7 @@ elif page == "🏢 Supplier Management":
             
             # Material category distribution
             st.markdown("**Material Category Coverage:**")
-            category_stats = {}
-            for category in MATERIAL_CATEGORIES:
-                count = suppliers_df['Material_Categories'].str.contains(category, case=False, na=False).sum()
-                category_stats[category] = count
+            category_stats = count_suppliers_by_category(suppliers_df)
             
             category_df = pd.DataFrame(list(category_stats.items()), columns=['Category', 'Supplier Count'])
             st.bar_chart(category_df.set_index('Category'))
@@ -581,7 +666,11 @@ elif page == "📧 Email Generation":
                                     'notes': f"Generated for materials: {', '.join(selected_categories)}"
                                 })
                                 
-                                st.info(f"📋 Order tracked with ID: {order_id}")
+                                # flush() retries the write if the automatic one failed
+                                if st.session_state.order_tracker.flush():
+                                    st.info(f"📋 Order tracked with ID: {order_id}")
+                                else:
+                                    st.warning(f"⚠️ Order {order_id} could not be saved to the orders file")
                         
                         except Exception as e:
                             st.error(f"❌ Error generating emails: {str(e)}")
@@ -596,6 +685,21 @@ elif page == "📧 Email Generation":
             
             # Get material categories for proper categorization
             selected_categories = st.session_state.get('last_selected_categories', [])
+            selected_lower = [(category, category.lower()) for category in selected_categories]
+            
+            # Category -> companies index, built once per supplier table
+            category_index = build_category_index(suppliers_df)
+            
+            # Many suppliers share the same materials string, so match each distinct string once
+            matches_by_materials = {}
+            
+            def match_selected_categories(materials_lower):
+                if materials_lower not in matches_by_materials:
+                    matches_by_materials[materials_lower] = [
+                        category for category, category_lower in selected_lower
+                        if category_lower in materials_lower
+                    ]
+                return matches_by_materials[materials_lower]
             
             # Categorize emails by country and their specific materials
             email_categories = {}
@@ -607,14 +711,13 @@ elif page == "📧 Email Generation":
                 
                 # Find this supplier's actual material specializations
                 company_name = email.get('company_name', '')
-                supplier_row = suppliers_df[suppliers_df['Company_Name'] == company_name]
-                if not supplier_row.empty:
-                    supplier_materials = supplier_row.iloc[0].get('Material_Categories', '')
-                    if supplier_materials:
-                        # Extract materials that match selected categories
-                        for category in selected_categories:
-                            if category.lower() in supplier_materials.lower():
-                                email_categories[country]['materials'].add(category)
+                # Skip matching once this country already covers every selected category
+                if len(email_categories[country]['materials']) < len(selected_categories):
+                    # Extract materials that match selected categories
+                    email_categories[country]['materials'].update(
+                        category for category in selected_categories
+                        if company_name in category_index.get(category.lower(), ())
+                    )
             
             # Display categories with specific materials
             st.markdown("**📂 Email Categories by Supplier Origin & Materials:**")
@@ -623,57 +726,59 @@ elif page == "📧 Email Generation":
                 materials_in_country = data['materials']
                 
                 # Format country name 
-                if country.lower() == 'china':
-                    country_display = "Chinese"
-                elif country.lower() == 'uae':
-                    country_display = "Emirati"
-                else:
-                    country_display = country
+                country_display = COUNTRY_DISPLAY_NAMES.get(country.lower(), country)
                 
                 material_text = ', '.join(sorted(materials_in_country)) if materials_in_country else 'All Selected Materials'
                 st.info(f"**{country_display}** ({len(country_emails)} suppliers): {material_text}")
             
             st.markdown("---")
             
-            # Display emails
-            for i, email_data in enumerate(emails):
-                with st.expander(f"📧 Email {i+1}: {email_data['company_name']}", expanded=False):
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.markdown("**Email Draft:**")
-                        st.text_area(
-                            "Email Content",
-                            value=email_data['email_body'],
-                            height=400,
-                            key=f"email_{i}",
-                            help="Copy this content to your email client"
-                        )
+            # Display only the selected email so widgets aren't built for every draft
+            i = st.selectbox(
+                "View Email",
+                range(len(emails)),
+                format_func=lambda idx: f"📧 Email {idx+1}: {emails[idx]['company_name']}"
+            )
+            email_data = emails[i]
+            
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.markdown("**Email Draft:**")
+                st.text_area(
+                    "Email Content",
+                    value=email_data['email_body'],
+                    height=400,
+                    key=f"email_{i}",
+                    help="Copy this content to your email client"
+                )
+            
+            with col2:
+                recipient_lines = [
+                    "**Recipient Details:**",
+                    f"**Company:** {email_data['company_name']}",
+                    f"**Contact:** {email_data['contact_person']}",
+                    f"**Email:** {email_data['email']}",
+                    f"**Country:** {email_data['country']}"
+                ]
+                
+                # Show supplier's specific materials
+                supplier_materials = email_data.get('materials', '')
+                if supplier_materials:
+                    # Find matching materials from selected categories
+                    matching_materials = match_selected_categories(supplier_materials.lower())
                     
-                    with col2:
-                        st.markdown("**Recipient Details:**")
-                        st.write(f"**Company:** {email_data['company_name']}")
-                        st.write(f"**Contact:** {email_data['contact_person']}")
-                        st.write(f"**Email:** {email_data['email']}")
-                        st.write(f"**Country:** {email_data['country']}")
-                        
-                        # Show supplier's specific materials
-                        supplier_materials = email_data.get('materials', '')
-                        if supplier_materials:
-                            # Find matching materials from selected categories
-                            matching_materials = []
-                            for category in selected_categories:
-                                if category.lower() in supplier_materials.lower():
-                                    matching_materials.append(category)
-                            
-                            if matching_materials:
-                                st.write(f"**Specializes in:** {', '.join(matching_materials)}")
-                            else:
-                                st.write(f"**Materials:** {supplier_materials}")
-                        
-                        # Copy button (now outside form)
-                        if st.button(f"📋 Copy Email {i+1}", key=f"copy_{i}"):
-                            st.code(email_data['email_body'], language=None)
+                    if matching_materials:
+                        recipient_lines.append(f"**Specializes in:** {', '.join(matching_materials)}")
+                    else:
+                        recipient_lines.append(f"**Materials:** {supplier_materials}")
+                
+                # One markdown element instead of one per field
+                st.markdown("  \n".join(recipient_lines))
+                
+                # Copy button (now outside form)
+                if st.button(f"📋 Copy Email {i+1}", key=f"copy_{i}"):
+                    st.code(email_data['email_body'], language=None)
             
             # Summary
             st.markdown("---")
@@ -682,7 +787,7 @@ elif page == "📧 Email Generation":
             with col1:
                 st.metric("Total Emails", len(emails))
             with col2:
-                unique_countries = len(set([email['country'] for email in emails]))
+                unique_countries = len({email['country'] for email in emails})
                 st.metric("Countries Covered", unique_countries)
             with col3:
                 exclude_origins_count = len(st.session_state.get('last_exclude_origins', []))
@@ -814,67 +919,35 @@ elif page == "📋 Order Tracking":
         with tab1:
             st.subheader("All Processed Orders")
             
-            # Display orders table
-            display_df = orders_df.copy()
-            display_df['Date_Processed'] = pd.to_datetime(display_df['Date_Processed']).dt.strftime('%Y-%m-%d %H:%M')
+            # Only send one page of rows to the client on each rerun
+            page_size = 100
+            start_row = 0
+            if len(orders_df) > page_size:
+                start_row = st.number_input(
+                    "Start row",
+                    min_value=0,
+                    max_value=len(orders_df) - 1,
+                    value=0,
+                    step=page_size
+                )
+                st.caption(f"Showing rows {start_row + 1}-{min(start_row + page_size, len(orders_df))} of {len(orders_df)}")
+            
+            # Display orders table, formatting dates on the displayed columns only
+            page_df = orders_df.iloc[start_row:start_row + page_size]
+            display_df = page_df[['Order_ID', 'Project_Name', 'Tender_Reference', 'Date_Processed', 
+                                  'Materials', 'Total_Suppliers', 'Emails_Sent', 'Status']].assign(
+                Date_Processed=pd.to_datetime(page_df['Date_Processed']).dt.strftime('%Y-%m-%d %H:%M')
+            )
             
             st.dataframe(
-                display_df[['Order_ID', 'Project_Name', 'Tender_Reference', 'Date_Processed', 
-                           'Materials', 'Total_Suppliers', 'Emails_Sent', 'Status']],
+                display_df,
                 use_container_width=True,
                 hide_index=True
             )
             
             # Order details expander
-            if len(display_df) > 0:
-                selected_order = st.selectbox("Select Order for Details", display_df['Order_ID'].tolist())
-                if selected_order:
-                    order_details = orders_df[orders_df['Order_ID'] == selected_order].iloc[0]
-                    
-                    with st.expander(f"📄 Order Details: {selected_order}", expanded=True):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write(f"**Project:** {order_details['Project_Name']}")
-                            st.write(f"**Reference:** {order_details['Tender_Reference']}")
-                            st.write(f"**Materials:** {order_details['Materials']}")
-                            st.write(f"**Status:** {order_details['Status']}")
-                        
-                        with col2:
-                            st.write(f"**Total Suppliers:** {order_details['Total_Suppliers']}")
-                            st.write(f"**Emails Sent:** {order_details['Emails_Sent']}")
-                            st.write(f"**Follow-up Date:** {order_details['Follow_Up_Date']}")
-                            st.write(f"**Supplier Categories:** {order_details['Supplier_Categories']}")
-                        
-                        # Update status form
-                        with st.form(f"update_status_{selected_order}"):
-                            new_status = st.selectbox(
-                                "Update Status",
-                                ["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"],
-                                index=["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"].index(order_details['Status']) if order_details['Status'] in ["Pending Response", "Quotes Received", "Under Review", "Follow Up Required", "Completed", "Cancelled"] else 0
-                            )
-                            
-                            notes = st.text_area("Add Notes", value=order_details.get('Notes', ''))
-                            
-                            if st.form_submit_button("Update Order"):
-                                success = st.session_state.order_tracker.update_order_status(selected_order, new_status, notes)
-                                if success:
-                                    st.success("✅ Order updated successfully!")
-                                    
-                                    # Log order tracking activity
-                                    order_data = {
-                                        'order_id': selected_order,
-                                        'project_name': order_details['Project_Name'],
-                                        'old_status': order_details['Status'],
-                                        'new_status': new_status,
-                                        'materials': order_details['Materials'],
-                                        'total_suppliers': order_details['Total_Suppliers']
-                                    }
-                                    st.session_state.data_collector.log_order_tracking(order_data)
-                                    
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Failed to update order.")
+            if len(orders_df) > 0:
+                render_order_details(orders_df)
         
         with tab2:
             st.subheader("Pending Follow-ups")
@@ -886,58 +959,77 @@ elif page == "📋 Order Tracking":
             else:
                 st.markdown(f"**{len(pending_orders)} orders require follow-up:**")
                 
-                for _, order in pending_orders.iterrows():
-                    with st.expander(f"⏰ {order['Order_ID']} - {order['Project_Name']}", expanded=False):
-                        col1, col2 = st.columns(2)
-                        
-                        with col1:
-                            st.write(f"**Project:** {order['Project_Name']}")
-                            st.write(f"**Materials:** {order['Materials']}")
-                            st.write(f"**Status:** {order['Status']}")
-                        
-                        with col2:
-                            st.write(f"**Emails Sent:** {order['Emails_Sent']}")
-                            st.write(f"**Follow-up Date:** {order['Follow_Up_Date']}")
-                            
-                            days_since = (datetime.now() - pd.to_datetime(order['Date_Processed'])).days
-                            st.write(f"**Days Since Sent:** {days_since}")
-                        
-                        if st.button(f"Mark as Followed Up", key=f"followup_{order['Order_ID']}"):
-                            success = st.session_state.order_tracker.update_order_status(order['Order_ID'], "Follow Up Completed")
-                            if success:
-                                st.success("✅ Marked as followed up!")
-                                st.rerun()
+                # Compute days since sent for all pending orders in one vectorized pass
+                days_since_sent = (pd.Timestamp.now() - pd.to_datetime(pending_orders['Date_Processed'])).dt.days
+                pending_orders = pending_orders.assign(Days_Since_Sent=days_since_sent)
+                
+                # One table plus a single detail panel instead of an expander per order. The
+                # selection is resolved by Order_ID, since row positions go stale once orders
+                # leave the table; the key version starts a fresh table after each follow-up
+                table_key = f"pending_orders_table_{st.session_state.get('pending_orders_table_version', 0)}"
+                st.session_state.pending_order_ids = pending_orders['Order_ID'].tolist()
+                st.dataframe(
+                    pending_orders[['Order_ID', 'Project_Name', 'Materials', 'Status', 'Days_Since_Sent']],
+                    use_container_width=True,
+                    hide_index=True,
+                    on_select=lambda: select_pending_order(table_key),
+                    selection_mode="single-row",
+                    key=table_key
+                )
+                
+                selected_order = st.session_state.get('selected_pending_order')
+                selected = pending_orders[pending_orders['Order_ID'] == selected_order]
+                if not selected.empty:
+                    order = selected.iloc[0]
+                    st.markdown(f"**⏰ {order['Order_ID']} - {order['Project_Name']}**")
+                    col1, col2 = st.columns(2)
+                    
+                    with col1:
+                        st.write(f"**Project:** {order['Project_Name']}")
+                        st.write(f"**Materials:** {order['Materials']}")
+                        st.write(f"**Status:** {order['Status']}")
+                    
+                    with col2:
+                        st.write(f"**Emails Sent:** {order['Emails_Sent']}")
+                        st.write(f"**Follow-up Date:** {order['Follow_Up_Date']}")
+                        st.write(f"**Days Since Sent:** {order['Days_Since_Sent']}")
+                    
+                    if st.button(f"Mark as Followed Up", key=f"followup_{order['Order_ID']}"):
+                        success = st.session_state.order_tracker.update_order_status(order['Order_ID'], "Follow Up Completed")
+                        if success:
+                            st.success("✅ Marked as followed up!")
+                            st.session_state.selected_pending_order = None
+                            st.session_state.pending_orders_table_version = st.session_state.get('pending_orders_table_version', 0) + 1
+                            st.rerun()
+                else:
+                    st.caption("Select an order in the table to see its details.")
         
         with tab3:
             st.subheader("Order Statistics")
             
-            col1, col2, col3, col4 = st.columns(4)
+            # Aggregate both count columns in one pass and reuse status counts for metric and chart
+            totals = orders_df[['Total_Suppliers', 'Emails_Sent']].sum()
+            status_counts = orders_df['Status'].value_counts()
             
-            with col1:
-                st.metric("Total Orders", len(orders_df))
-            with col2:
-                pending_count = len(orders_df[orders_df['Status'] == 'Pending Response'])
-                st.metric("Pending Response", pending_count)
-            with col3:
-                total_suppliers = orders_df['Total_Suppliers'].sum()
-                st.metric("Total Suppliers Contacted", total_suppliers)
-            with col4:
-                total_emails = orders_df['Emails_Sent'].sum()
-                st.metric("Total Emails Generated", total_emails)
+            metrics_row([
+                ("Total Orders", len(orders_df), None),
+                ("Pending Response", int(status_counts.get('Pending Response', 0)), None),
+                ("Total Suppliers Contacted", totals['Total_Suppliers'], None),
+                ("Total Emails Generated", totals['Emails_Sent'], None)
+            ])
             
             # Status distribution
             st.markdown("**Order Status Distribution:**")
-            status_counts = orders_df['Status'].value_counts()
             st.bar_chart(status_counts)
             
             # Materials frequency
             st.markdown("**Most Requested Materials:**")
-            all_materials = []
-            for materials in orders_df['Materials'].dropna():
-                all_materials.extend([m.strip() for m in materials.split(',')])
+            material_counts = (
+                orders_df['Materials'].dropna().astype(str).str.split(',').explode().str.strip()
+                .value_counts().head(10)
+            )
             
-            if all_materials:
-                material_counts = pd.Series(all_materials).value_counts().head(10)
+            if not material_counts.empty:
                 st.bar_chart(material_counts)
 
 elif page == "📊 Dashboard":
@@ -948,47 +1040,21 @@ elif page == "📊 Dashboard":
     suppliers_df = st.session_state.supplier_manager.load_suppliers()
     
     # Key metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            "Total Suppliers",
-            len(suppliers_df),
-            help="Total number of suppliers in the database"
-        )
-    
-    with col2:
-        if not suppliers_df.empty:
-            countries_count = suppliers_df['Country'].nunique()
-        else:
-            countries_count = 0
-        st.metric(
-            "Countries Covered",
-            countries_count,
-            help="Number of countries represented in supplier database"
-        )
+    if not suppliers_df.empty:
+        # Sum boolean masks directly rather than materializing filtered frames
+        country_col = suppliers_df['Country']
+        countries_count = country_col.nunique()
+        chinese_suppliers = int((country_col == 'China').sum())
+        recent_suppliers = int((suppliers_df['Established_Year'] >= 2020).sum())
+    else:
+        countries_count = chinese_suppliers = recent_suppliers = 0
     
-    with col3:
-        if not suppliers_df.empty:
-            chinese_suppliers = len(suppliers_df[suppliers_df['Country'] == 'China'])
-        else:
-            chinese_suppliers = 0
-        st.metric(
-            "Chinese Suppliers",
-            chinese_suppliers,
-            help="Number of suppliers from China"
-        )
-    
-    with col4:
-        if not suppliers_df.empty:
-            recent_suppliers = len(suppliers_df[suppliers_df['Established_Year'] >= 2020])
-        else:
-            recent_suppliers = 0
-        st.metric(
-            "Recent Suppliers",
-            recent_suppliers,
-            help="Suppliers established since 2020"
-        )
+    metrics_row([
+        ("Total Suppliers", len(suppliers_df), "Total number of suppliers in the database"),
+        ("Countries Covered", countries_count, "Number of countries represented in supplier database"),
+        ("Chinese Suppliers", chinese_suppliers, "Number of suppliers from China"),
+        ("Recent Suppliers", recent_suppliers, "Suppliers established since 2020")
+    ])
     
     # Charts and visualizations
     if not suppliers_df.empty:
@@ -1001,10 +1067,7 @@ elif page == "📊 Dashboard":
         
         with col2:
             st.markdown("**🔧 Material Category Coverage**")
-            category_stats = {}
-            for category in MATERIAL_CATEGORIES:
-                count = suppliers_df['Material_Categories'].str.contains(category, case=False, na=False).sum()
-                category_stats[category] = count
+            category_stats = count_suppliers_by_category(suppliers_df)
             
             category_df = pd.DataFrame(list(category_stats.items()), columns=['Category', 'Count'])
             st.bar_chart(category_df.set_index('Category'))
@@ -1014,16 +1077,16 @@ elif page == "📊 Dashboard":
         
         compliance_data = []
         regions = {
-            'Chinese': ('China', 10),
-            'Emirati': ('UAE', 10),
+            'Chinese': (['China'], 10),
+            'Emirati': (['UAE'], 10),
             'European': (['Germany', 'France', 'Austria', 'Denmark', 'Finland'], 10)
         }
         
+        # Count suppliers per country once and sum per region
+        country_counts = suppliers_df['Country'].value_counts().to_dict()
+        
         for region_name, (countries, required) in regions.items():
-            if isinstance(countries, list):
-                count = len(suppliers_df[suppliers_df['Country'].isin(countries)])
-            else:
-                count = len(suppliers_df[suppliers_df['Country'] == countries])
+            count = sum(country_counts.get(country, 0) for country in countries)
             
             compliance_data.append({
                 'Region': region_name,
@@ -1042,38 +1105,13 @@ elif page == "📊 Dashboard":
         usage_stats = st.session_state.data_collector.get_usage_statistics()
         
         if usage_stats:
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "Total Activities",
-                    usage_stats.get('total_activities', 0),
-                    help="Total user interactions logged"
-                )
-            
-            with col2:
-                doc_processed = usage_stats.get('activity_breakdown', {}).get('document_processed', 0)
-                st.metric(
-                    "Documents Processed",
-                    doc_processed,
-                    help="Number of documents processed"
-                )
-            
-            with col3:
-                emails_generated = usage_stats.get('activity_breakdown', {}).get('email_generated', 0)
-                st.metric(
-                    "Emails Generated",
-                    emails_generated,
-                    help="Number of email drafts created"
-                )
-            
-            with col4:
-                supplier_searches = usage_stats.get('activity_breakdown', {}).get('supplier_searched', 0)
-                st.metric(
-                    "Supplier Searches",
-                    supplier_searches,
-                    help="Number of supplier searches performed"
-                )
+            activity_breakdown = usage_stats.get('activity_breakdown', {})
+            metrics_row([
+                ("Total Activities", usage_stats.get('total_activities', 0), "Total user interactions logged"),
+                ("Documents Processed", activity_breakdown.get('document_processed', 0), "Number of documents processed"),
+                ("Emails Generated", activity_breakdown.get('email_generated', 0), "Number of email drafts created"),
+                ("Supplier Searches", activity_breakdown.get('supplier_searched', 0), "Number of supplier searches performed")
+            ])
             
             # Activity breakdown chart
             if usage_stats.get('activity_breakdown'):
@@ -1,8 +1,23 @@
 import re
+from bisect import bisect_left, bisect_right
 from datetime import datetime, date, timedelta
 from typing import Optional, List
 import calendar
 
+# Joins texts for batch extraction; neither \w, \s nor any date/context pattern matches it
+BATCH_SEPARATOR = '\x00'
+
+# Formats accepted by DeadlineCalculator._parse_date_string, split by whether they start with a month name
+NUMERIC_FIRST_DATE_FORMATS = (
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y',
+    '%d.%m.%Y', '%m.%d.%Y', '%Y/%m/%d', '%d %B %Y', '%d %b %Y'
+)
+MONTH_FIRST_DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y', '%B %d %Y', '%b %d %Y')
+
+# Days to step from each weekday (Monday = 0) to the next / previous business day
+NEXT_BUSINESS_DAY_OFFSETS = (1, 1, 1, 1, 3, 2, 1)
+PREVIOUS_BUSINESS_DAY_OFFSETS = (3, 1, 1, 1, 1, 1, 2)
+
 class DeadlineCalculator:
     """
     Handles deadline detection, parsing, and calculation for procurement workflows.
@@ -18,6 +33,17 @@ class DeadlineCalculator:
         """
         self.buffer_days = buffer_days
         
+        # Month name mappings
+        self.months = {
+            'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+            'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
+            'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
+            'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+        }
+        
+        # Only known month names can match, longest spelling first
+        month_names = r'\b(' + '|'.join(sorted(self.months, key=len, reverse=True)) + r')\b'
+        
         # Date patterns for extraction
         self.date_patterns = [
             # Standard formats
@@ -26,9 +52,9 @@ class DeadlineCalculator:
             (r'(\d{4})[\/\-\.](\d{1,2})[\/\-\.](\d{1,2})', 'ymd'),  # YYYY/MM/DD
             
             # Text-based dates
-            (r'(\w+)\s+(\d{1,2}),?\s+(\d{4})', 'month_day_year'),  # December 15, 2024
-            (r'(\d{1,2})\s+(\w+)\s+(\d{4})', 'day_month_year'),    # 15 December 2024
-            (r'(\w+)\s+(\d{1,2})\w{0,2},?\s+(\d{4})', 'month_day_year_ord'),  # December 15th, 2024
+            (month_names + r'\s+(\d{1,2}),?\s+(\d{4})', 'month_day_year'),  # December 15, 2024
+            (r'(\d{1,2})\s+' + month_names + r'\s+(\d{4})', 'day_month_year'),    # 15 December 2024
+            (month_names + r'\s+(\d{1,2})\w{0,2},?\s+(\d{4})', 'month_day_year_ord'),  # December 15th, 2024
         ]
         
         # Context patterns that indicate deadlines
@@ -44,20 +70,43 @@ class DeadlineCalculator:
             r'quotation\s*(?:deadline|due)\s*:?\s*'
         ]
         
-        # Month name mappings
-        self.months = {
-            'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-            'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
-            'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-            'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+        # Compile once: contexts and date patterns each as one alternation so a text
+        # is scanned a single time per kind. The contexts sit in a lookahead so hits of
+        # different contexts may overlap, as they would when scanned one by one. Dates
+        # do not overlap: text matched as one date is never re-read as a shorter date of
+        # another format inside it (2027-01-30 is not also 27-01-30 in dd-mm-yy). Every
+        # date pattern has three groups, which follow its named group.
+        self._context_re = re.compile(
+            '(?=' + '|'.join(f'(?P<context_{i}>{pattern})' for i, pattern in enumerate(self.deadline_contexts)) + ')'
+        )
+        self._date_re = re.compile(
+            '|'.join(f'(?P<{format_type}>{pattern})' for pattern, format_type in self.date_patterns),
+            re.IGNORECASE
+        )
+        self._date_group_index = {
+            format_type: self._date_re.groupindex[format_type] for _, format_type in self.date_patterns
+        }
+        self._date_priority = {
+            format_type: priority for priority, (_, format_type) in enumerate(self.date_patterns)
+        }
+        # Position of the (day, month, year) components within each format's groups
+        self._date_layouts = {
+            'dmy': (0, 1, 2),
+            'dmy_short': (0, 1, 2),
+            'ymd': (2, 1, 0),
+            'month_day_year': (1, 0, 2),
+            'day_month_year': (0, 1, 2),
+            'month_day_year_ord': (1, 0, 2),
         }
+        
     
-    def calculate_supplier_deadline(self, client_deadline) -> Optional[date]:
+    def calculate_supplier_deadline(self, client_deadline, today: Optional[date] = None) -> Optional[date]:
         """
         Calculate supplier deadline based on client deadline.
         
         Args:
             client_deadline: Client deadline (datetime, date, or string)
+            today: Reference date, defaults to date.today()
             
         Returns:
             Supplier deadline as date object, or None if invalid
@@ -78,7 +127,8 @@ class DeadlineCalculator:
             supplier_deadline = client_deadline - timedelta(days=self.buffer_days)
             
             # Ensure supplier deadline is not in the past
-            today = date.today()
+            if today is None:
+                today = date.today()
             if supplier_deadline < today:
                 # If calculated deadline is in the past, use today as supplier deadline
                 supplier_deadline = today
@@ -88,12 +138,13 @@ class DeadlineCalculator:
         except Exception:
             return None
     
-    def extract_deadline_from_text(self, text: str) -> Optional[date]:
+    def extract_deadline_from_text(self, text: str, today: Optional[date] = None) -> Optional[date]:
         """
         Extract deadline from text using various patterns and contexts.
         
         Args:
             text: Text to search for deadlines
+            today: Reference date for rejecting past dates, defaults to date.today()
             
         Returns:
             Extracted deadline as date object, or None if not found
@@ -101,97 +152,183 @@ class DeadlineCalculator:
         if not text:
             return None
         
-        # Convert to lowercase for processing
-        text_lower = text.lower()
+        if today is None:
+            today = date.today()
+        
+        # Context words are matched on the lowercased text
+        context_hits = self._collect_context_hits(self._context_re.finditer(text.lower()), 0)
+        
+        # One date scan serves both the context vicinities and the full-text fallback
+        date_hits = self._collect_date_hits(self._date_re.finditer(text), 0)
+        return self._resolve_deadline(text, context_hits, date_hits, today)
+    
+    def extract_deadlines_batch(self, texts: List[str], today: Optional[date] = None) -> List[Optional[date]]:
+        """
+        Extract deadlines from several texts with one regex scan per pattern set.
+        
+        Args:
+            texts: Texts to search for deadlines
+            today: Reference date for rejecting past dates, defaults to date.today()
+            
+        Returns:
+            Extracted deadline (or None) for each text, in input order
+        """
+        if today is None:
+            today = date.today()
+        
+        texts = [text or '' for text in texts]
+        lower_texts = [text.lower() for text in texts]
+        
+        # No date or context pattern can match across the separator
+        joined = BATCH_SEPARATOR.join(texts)
+        joined_lower = BATCH_SEPARATOR.join(lower_texts)
+        text_starts = self._batch_offsets(texts)
+        lower_starts = self._batch_offsets(lower_texts)
+        
+        date_matches = [[] for _ in texts]
+        for match in self._date_re.finditer(joined):
+            date_matches[bisect_right(text_starts, match.start()) - 1].append(match)
+        
+        context_matches = [[] for _ in texts]
+        for context_match in self._context_re.finditer(joined_lower):
+            context_matches[bisect_right(lower_starts, context_match.start()) - 1].append(context_match)
+        
+        results = []
+        for index, text in enumerate(texts):
+            if not text:
+                results.append(None)
+                continue
+            context_hits = self._collect_context_hits(context_matches[index], lower_starts[index])
+            date_hits = self._collect_date_hits(date_matches[index], text_starts[index])
+            results.append(self._resolve_deadline(text, context_hits, date_hits, today))
+        
+        return results
+    
+    @staticmethod
+    def _batch_offsets(texts: List[str]) -> List[int]:
+        """Start offset of each text once joined with BATCH_SEPARATOR."""
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + len(BATCH_SEPARATOR)
+        return offsets
+    
+    def _collect_context_hits(self, context_matches, base: int) -> List[tuple]:
+        """
+        Turn context matches into (priority, start, end) hits sorted by context precedence then position.
+        
+        Args:
+            context_matches: Matches of the combined context pattern
+            base: Offset to subtract from match positions
+            
+        Returns:
+            Sorted list of context hits
+        """
+        context_hits = []
+        for context_match in context_matches:
+            context_group = context_match.lastgroup
+            priority = int(context_group.rsplit('_', 1)[1])
+            context_hits.append((priority, context_match.start(context_group) - base,
+                                 context_match.end(context_group) - base))
+        context_hits.sort()
+        return context_hits
+    
+    def _collect_date_hits(self, date_matches, base: int) -> List[tuple]:
+        """
+        Parse date matches into (start, end, priority, date) hits in text order.
+        
+        Args:
+            date_matches: Matches of the combined date pattern, in text order
+            base: Offset to subtract from match positions
+            
+        Returns:
+            List of date hits; the date is None when the match is not a valid date
+        """
+        date_hits = []
+        for match in date_matches:
+            format_type = match.lastgroup
+            group_index = self._date_group_index[format_type]
+            groups = match.group(group_index + 1, group_index + 2, group_index + 3)
+            date_hits.append((match.start() - base, match.end() - base,
+                              self._date_priority[format_type], self._parse_match(groups, format_type)))
+        return date_hits
+    
+    def _resolve_deadline(self, text: str, context_hits: List[tuple], date_hits: List[tuple],
+                          today: date) -> Optional[date]:
+        """
+        Pick the deadline near the first productive context, falling back to any date in the text.
+        
+        Args:
+            text: Text being searched
+            context_hits: Sorted context hits within the text
+            date_hits: Date hits over the whole text
+            today: Dates before this are ignored
+            
+        Returns:
+            Extracted deadline, or None
+        """
+        date_starts = [hit[0] for hit in date_hits]
         
         # Try to find dates near deadline context words
-        for context_pattern in self.deadline_contexts:
-            context_matches = list(re.finditer(context_pattern, text_lower))
+        for _, context_start, context_end in context_hits:
+            # Look for dates lying wholly in the vicinity of the context
+            start_pos = max(0, context_start - 50)
+            end_pos = min(len(text), context_end + 100)
+            first = bisect_left(date_starts, start_pos)
+            last = bisect_left(date_starts, end_pos)
+            vicinity_hits = [hit for hit in date_hits[first:last] if hit[1] <= end_pos]
             
-            for context_match in context_matches:
-                # Look for dates in the vicinity of the context
-                start_pos = max(0, context_match.start() - 50)
-                end_pos = min(len(text), context_match.end() + 100)
-                vicinity_text = text[start_pos:end_pos]
-                
-                # Try to find a date in this vicinity
-                found_date = self._find_date_in_text(vicinity_text)
-                if found_date:
-                    return found_date
+            found_date = self._first_future_date(vicinity_hits, today)
+            if found_date:
+                return found_date
         
         # If no contextual date found, try to find any date in the text
-        return self._find_date_in_text(text)
+        return self._first_future_date(date_hits, today)
     
-    def _find_date_in_text(self, text: str) -> Optional[date]:
+    def _first_future_date(self, date_hits: List[tuple], today: date) -> Optional[date]:
         """
-        Find the first valid date in the given text.
+        Pick the first future date among date hits.
         
         Args:
-            text: Text to search
+            date_hits: Date hits in text order
+            today: Dates before this are ignored
             
         Returns:
             First valid date found, or None
         """
-        for pattern, format_type in self.date_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            
-            for match in matches:
-                parsed_date = self._parse_match(match, format_type)
-                if parsed_date:
-                    # Only return future dates
-                    if parsed_date >= date.today():
-                        return parsed_date
-        
-        return None
+        # Earlier patterns take precedence; within a pattern the first date in the text wins
+        best = None
+        for _, _, priority, parsed_date in date_hits:
+            # Only return future dates
+            if parsed_date and parsed_date >= today:
+                if priority == 0:
+                    return parsed_date
+                if best is None or priority < best[0]:
+                    best = (priority, parsed_date)
+        
+        return best[1] if best else None
     
-    def _parse_match(self, match, format_type: str) -> Optional[date]:
+    def _parse_match(self, groups, format_type: str) -> Optional[date]:
         """
-        Parse a regex match based on the format type.
+        Parse the groups of a date match based on the format type.
         
         Args:
-            match: Regex match object
+            groups: Tuple of the three captured date components
             format_type: Type of date format
             
         Returns:
             Parsed date or None
         """
+        day_index, month_index, year_index = self._date_layouts[format_type]
         try:
-            groups = match.groups()
-            
-            if format_type == 'dmy':
-                day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                return date(year, month, day)
-            
-            elif format_type == 'dmy_short':
-                day, month, year = int(groups[0]), int(groups[1]), int(groups[2])
-                # Handle 2-digit years
-                if year < 50:
-                    year += 2000
-                else:
-                    year += 1900 if year > 50 else 2000
-                return date(year, month, day)
-            
-            elif format_type == 'ymd':
-                year, month, day = int(groups[0]), int(groups[1]), int(groups[2])
-                return date(year, month, day)
-            
-            elif format_type == 'month_day_year':
-                month_name, day, year = groups[0].lower(), int(groups[1]), int(groups[2])
-                month = self.months.get(month_name)
-                if month:
-                    return date(year, month, day)
-            
-            elif format_type == 'day_month_year':
-                day, month_name, year = int(groups[0]), groups[1].lower(), int(groups[2])
-                month = self.months.get(month_name)
-                if month:
-                    return date(year, month, day)
-            
-            elif format_type == 'month_day_year_ord':
-                month_name, day, year = groups[0].lower(), int(groups[1]), int(groups[2])
-                month = self.months.get(month_name)
-                if month:
-                    return date(year, month, day)
+            day, month, year = int(groups[day_index]), groups[month_index], int(groups[year_index])
+            # Month names only come from the months table, so the lookup cannot miss
+            month = int(month) if month.isdigit() else self.months[month.lower()]
+            if format_type == 'dmy_short':
+                # Handle 2-digit years: 00-49 are 2000s, 50-99 are 1900s
+                year += 2000 if year < 50 else 1900
+            return date(year, month, day)
         
         except (ValueError, TypeError):
             pass
@@ -208,16 +345,22 @@ class DeadlineCalculator:
         Returns:
             Parsed date or None
         """
-        # Common date formats to try
-        formats = [
-            '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y',
-            '%d.%m.%Y', '%m.%d.%Y', '%Y/%m/%d', '%B %d, %Y', '%b %d, %Y',
-            '%d %B %Y', '%d %b %Y', '%B %d %Y', '%b %d %Y'
-        ]
+        date_str = date_str.strip()
+        if not date_str:
+            return None
         
+        # Zero-padded ISO dates are parsed in C without trying any format
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            try:
+                return date.fromisoformat(date_str)
+            except ValueError:
+                pass
+        
+        # Only formats that can match the first character are tried, in their usual order
+        formats = MONTH_FIRST_DATE_FORMATS if date_str[0].isalpha() else NUMERIC_FIRST_DATE_FORMATS
         for fmt in formats:
             try:
-                return datetime.strptime(date_str.strip(), fmt).date()
+                return datetime.strptime(date_str, fmt).date()
             except ValueError:
                 continue
         
@@ -245,10 +388,7 @@ class DeadlineCalculator:
         Returns:
             Next business day
         """
-        next_day = from_date + timedelta(days=1)
-        while not self.is_business_day(next_day):
-            next_day += timedelta(days=1)
-        return next_day
+        return from_date + timedelta(days=NEXT_BUSINESS_DAY_OFFSETS[from_date.weekday()])
     
     def get_previous_business_day(self, from_date: date) -> date:
         """
@@ -260,10 +400,7 @@ class DeadlineCalculator:
         Returns:
             Previous business day
         """
-        prev_day = from_date - timedelta(days=1)
-        while not self.is_business_day(prev_day):
-            prev_day -= timedelta(days=1)
-        return prev_day
+        return from_date - timedelta(days=PREVIOUS_BUSINESS_DAY_OFFSETS[from_date.weekday()])
     
     def calculate_business_days_between(self, start_date: date, end_date: date) -> int:
         """
@@ -279,24 +416,26 @@ class DeadlineCalculator:
         if start_date > end_date:
             start_date, end_date = end_date, start_date
         
-        business_days = 0
-        current_date = start_date
-        
-        while current_date <= end_date:
-            if self.is_business_day(current_date):
+        # Every full week has five business days; only the remainder needs counting
+        full_weeks, remainder = divmod((end_date - start_date).days + 1, 7)
+        start_weekday = start_date.weekday()
+        business_days = full_weeks * 5
+        for offset in range(remainder):
+            if (start_weekday + offset) % 7 < 5:
                 business_days += 1
-            current_date += timedelta(days=1)
         
         return business_days
     
     def suggest_optimal_supplier_deadline(self, client_deadline: date, 
-                                        complexity_factor: float = 1.0) -> date:
+                                        complexity_factor: float = 1.0,
+                                        today: Optional[date] = None) -> date:
         """
         Suggest an optimal supplier deadline based on project complexity.
         
         Args:
             client_deadline: Client deadline
             complexity_factor: Factor to adjust buffer (1.0 = normal, >1.0 = more complex)
+            today: Reference date, defaults to date.today()
             
         Returns:
             Suggested supplier deadline
@@ -312,23 +451,26 @@ class DeadlineCalculator:
             supplier_deadline = self.get_previous_business_day(supplier_deadline)
         
         # Ensure it's not in the past
-        today = date.today()
+        if today is None:
+            today = date.today()
         if supplier_deadline < today:
             supplier_deadline = self.get_next_business_day(today)
         
         return supplier_deadline
     
-    def get_deadline_status(self, deadline_date: date) -> dict:
+    def get_deadline_status(self, deadline_date: date, today: Optional[date] = None) -> dict:
         """
         Get status information about a deadline.
         
         Args:
             deadline_date: Deadline to check
+            today: Reference date, defaults to date.today()
             
         Returns:
             Dictionary with status information
         """
-        today = date.today()
+        if today is None:
+            today = date.today()
         days_remaining = (deadline_date - today).days
         
         if days_remaining < 0:
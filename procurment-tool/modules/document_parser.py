@@ -3,9 +3,34 @@ import pandas as pd
 import re
 from datetime import datetime, timedelta, date
 import os
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from io import BytesIO, StringIO
 
+# google-re2 runs a linear-time automaton with the re API; it is optional
+try:
+    import re2 as full_text_re
+except ImportError:
+    full_text_re = re
+
+DATE_FORMATS = (
+    '%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y',
+    '%m.%d.%Y', '%d.%m.%Y', '%Y-%m-%d', '%Y/%m/%d',
+    '%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y'
+)
+
+@lru_cache(maxsize=2048)
+def _parse_date_string_cached(date_str: str) -> Optional[date]:
+    """Parse a date string against DATE_FORMATS; repeated strings are served from the cache."""
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    
+    return None
+
 class DocumentParser:
     """
     Handles parsing of various document formats including PDF, Word, Excel, and text.
@@ -39,6 +64,45 @@ class DocumentParser:
             'material', 'size', 'pressure', 'temperature', 'api', 'astm',
             'asme', 'din', 'en', 'iso', 'class', 'rating'
         ]
+        
+        # Technical patterns (sizes, grades, standards) marking specification lines
+        self.technical_patterns = [
+            r'\d+["\']\s*(?:diameter|dia|pipe|tube)',  # Size specifications
+            r'(?:grade|class|schedule|rating)\s*[a-z0-9]+',  # Grades and standards
+            r'(?:api|ansi|astm|asme|iso)\s*[0-9a-z-]+',  # Standards
+            r'\d+\s*(?:mm|cm|in|inch|"|\')',  # Measurements
+            r'(?:carbon|stainless|alloy)\s*steel',  # Materials
+            r'(?:ball|gate|check|globe)\s*valve',  # Valve types
+        ]
+        
+        # Patterns for project name, matched on lowercased text; . stops at the line end
+        self.project_patterns = [
+            r'project\s*:?\s*(.+)',
+            r'project\s+name\s*:?\s*(.+)',
+            r'(?:title|name)\s*:?\s*(.+)',
+        ]
+        
+        # Patterns for tender reference
+        self.reference_patterns = [
+            r'(?:tender|ref|reference)\s*(?:no|number|#)?\s*:?\s*([A-Z0-9-]+)',
+            r'(?:rfq|rfp|tender)\s*:?\s*([A-Z0-9-]+)',
+            r'ref\s*:?\s*([A-Z0-9-]+)',
+        ]
+        
+        # A keyword containing another keyword of the same material can never be the
+        # first hit, so only the minimal keywords are scanned for
+        self._material_scan_keywords = tuple(
+            (material, tuple(keyword for keyword in keywords
+                             if not any(other != keyword and other in keyword for other in keywords)))
+            for material, keywords in self.material_keywords.items()
+        )
+        
+        # Compile every pattern once instead of on each document or line. Patterns scanned
+        # over the whole document use RE2 when available; (?i) works in both engines.
+        self._deadline_res = [full_text_re.compile('(?i)' + pattern) for pattern in self.deadline_patterns]
+        self._technical_res = [re.compile(pattern) for pattern in self.technical_patterns]
+        self._project_res = [full_text_re.compile(pattern) for pattern in self.project_patterns]
+        self._reference_res = [full_text_re.compile('(?i)' + pattern) for pattern in self.reference_patterns]
     
     def parse_file(self, uploaded_file) -> Dict[str, Any]:
         """
@@ -96,12 +160,16 @@ class DocumentParser:
         try:
             import pdfplumber
             
-            text = ""
+            # Collect pieces and join once; += would copy the whole text on every page
+            parts = []
             with pdfplumber.open(uploaded_file) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
+                    # Free the page's cached layout objects so memory stays flat across pages
+                    page.close()
                     if page_text:
-                        text += page_text + "\n"
+                        parts.append(page_text + "\n")
+            text = "".join(parts)
             
             if not text.strip():
                 # If no text extracted, try OCR
@@ -132,17 +200,19 @@ class DocumentParser:
             from docx import Document
             
             doc = Document(uploaded_file)
-            text = ""
+            parts = []
             
             for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+                parts.append(paragraph.text + "\n")
             
             # Extract text from tables
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        text += cell.text + " "
-                    text += "\n"
+                        parts.append(cell.text + " ")
+                    parts.append("\n")
+            
+            text = "".join(parts)
             
             return self._analyze_text(text)
         
@@ -166,16 +236,18 @@ class DocumentParser:
     def _parse_excel(self, uploaded_file) -> Dict[str, Any]:
         """Parse Excel file using pandas."""
         try:
-            # Try to read all sheets
-            excel_file = pd.ExcelFile(uploaded_file)
-            text = ""
+            # Read all sheets in one pass over the workbook
+            sheets = pd.read_excel(uploaded_file, sheet_name=None)
             
-            for sheet_name in excel_file.sheet_names:
-                df = pd.read_excel(uploaded_file, sheet_name=sheet_name)
-                
-                # Convert DataFrame to text
-                text += f"Sheet: {sheet_name}\n"
-                text += df.to_string(index=False) + "\n\n"
+            # Convert each DataFrame to text: header then one space-separated line per row.
+            # Column alignment (to_string) is skipped; only the values matter for extraction.
+            parts = []
+            for sheet_name, df in sheets.items():
+                parts.append(f"Sheet: {sheet_name}\n")
+                parts.append(" ".join(map(str, df.columns)) + "\n")
+                parts.extend(" ".join(map(str, row)) + "\n" for row in df.itertuples(index=False, name=None))
+                parts.append("\n")
+            text = "".join(parts)
             
             return self._analyze_text(text)
         
@@ -201,13 +273,13 @@ class DocumentParser:
             
             # Convert PDF to images and perform OCR
             images = pdf2image.convert_from_bytes(uploaded_file.getvalue())
-            text = ""
+            if not images:
+                return ""
             
-            for image in images:
-                ocr_text = pytesseract.image_to_string(image)
-                text += ocr_text + "\n"
-            
-            return text
+            # Each call runs a tesseract subprocess, so threads already use all cores
+            with ThreadPoolExecutor(max_workers=min(len(images), os.cpu_count() or 1)) as executor:
+                page_texts = executor.map(pytesseract.image_to_string, images)
+                return "".join(page_text + "\n" for page_text in page_texts)
         
         except ImportError:
             return "OCR libraries not available. Cannot extract text from scanned documents."
@@ -233,10 +305,10 @@ class DocumentParser:
         deadline = self._extract_deadline(text)
         
         # Extract specifications
-        specifications = self._extract_specifications(text)
+        specifications = self._extract_specifications(text, text_lower)
         
         # Extract project info
-        project_info = self._extract_project_info(text)
+        project_info = self._extract_project_info(text, text_lower)
         
         return {
             'text': text,
@@ -251,22 +323,21 @@ class DocumentParser:
         """Extract material categories from text."""
         found_materials = []
         
-        for material, keywords in self.material_keywords.items():
+        for material, keywords in self._material_scan_keywords:
             for keyword in keywords:
                 if keyword in text_lower:
-                    if material not in found_materials:
-                        found_materials.append(material)
+                    found_materials.append(material)
                     break
         
         return found_materials
     
     def _extract_deadline(self, text: str) -> Optional[datetime]:
         """Extract deadline from text using regex patterns."""
-        for pattern in self.deadline_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                date_str = match.group(1)
-                parsed_date = self._parse_date_string(date_str)
+        # One scan per pattern: a combined alternation would let a lower-priority match
+        # consume text that a higher-priority pattern needs
+        for deadline_re in self._deadline_res:
+            for match in deadline_re.finditer(text):
+                parsed_date = self._parse_date_string(match.group(1))
                 if parsed_date:
                     return parsed_date
         
@@ -274,29 +345,19 @@ class DocumentParser:
     
     def _parse_date_string(self, date_str: str) -> Optional[date]:
         """Parse various date string formats."""
-        date_formats = [
-            '%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y',
-            '%m.%d.%Y', '%d.%m.%Y', '%Y-%m-%d', '%Y/%m/%d',
-            '%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except ValueError:
-                continue
-        
-        return None
+        return _parse_date_string_cached(date_str)
     
-    def _extract_specifications(self, text: str) -> List[str]:
+    def _extract_specifications(self, text: str, text_lower: str) -> List[str]:
         """Extract technical specifications from text."""
         specifications = []
-        lines = text.split('\n')
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            if not line_lower:
+        # The document is lowercased once by the caller; its lines pair up with the originals
+        for line, line_lower in zip(text.split('\n'), text_lower.split('\n')):
+            # Lines too short to keep are skipped before any matching
+            clean_spec = line.strip()
+            if len(clean_spec) <= 5:  # Reduced minimum length
                 continue
+            line_lower = line_lower.strip()
             
             # Check if line contains specification keywords or material-related terms
             is_specification = False
@@ -307,61 +368,27 @@ class DocumentParser:
             
             # Also check for lines with technical patterns (sizes, grades, standards)
             if not is_specification:
-                technical_patterns = [
-                    r'\d+["\']\s*(?:diameter|dia|pipe|tube)',  # Size specifications
-                    r'(?:grade|class|schedule|rating)\s*[a-z0-9]+',  # Grades and standards
-                    r'(?:api|ansi|astm|asme|iso)\s*[0-9a-z-]+',  # Standards
-                    r'\d+\s*(?:mm|cm|in|inch|"|\')',  # Measurements
-                    r'(?:carbon|stainless|alloy)\s*steel',  # Materials
-                    r'(?:ball|gate|check|globe)\s*valve',  # Valve types
-                ]
-                for pattern in technical_patterns:
-                    if re.search(pattern, line_lower):
+                for technical_re in self._technical_res:
+                    if technical_re.search(line_lower):
                         is_specification = True
                         break
             
             if is_specification:
-                # Clean and add the specification
-                clean_spec = line.strip()
-                if clean_spec and len(clean_spec) > 5:  # Reduced minimum length
-                    specifications.append(clean_spec)
+                specifications.append(clean_spec)
         
         # Remove duplicates while preserving order
-        unique_specs = []
-        for spec in specifications:
-            if spec not in unique_specs:
-                unique_specs.append(spec)
-        
-        return unique_specs  # Return all specifications found
+        return list(dict.fromkeys(specifications))  # Return all specifications found
     
-    def _extract_project_info(self, text: str) -> Dict[str, str]:
+    def _extract_project_info(self, text: str, text_lower: str) -> Dict[str, str]:
         """Extract project name and tender reference from text."""
         project_info = {
             'project_name': '',
             'tender_reference': ''
         }
         
-        lines = text.split('\n')
-        
-        # Patterns for project name
-        project_patterns = [
-            r'project\s*:?\s*(.+?)(?:\n|$)',
-            r'project\s+name\s*:?\s*(.+?)(?:\n|$)',
-            r'(?:title|name)\s*:?\s*(.+?)(?:\n|$)',
-        ]
-        
-        # Patterns for tender reference
-        reference_patterns = [
-            r'(?:tender|ref|reference)\s*(?:no|number|#)?\s*:?\s*([A-Z0-9-]+)',
-            r'(?:rfq|rfp|tender)\s*:?\s*([A-Z0-9-]+)',
-            r'ref\s*:?\s*([A-Z0-9-]+)',
-        ]
-        
-        text_lower = text.lower()
-        
         # Extract project name
-        for pattern in project_patterns:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
+        for project_re in self._project_res:
+            match = project_re.search(text_lower)
             if match:
                 project_name = match.group(1).strip()
                 if len(project_name) > 3 and len(project_name) < 100:
@@ -369,8 +396,8 @@ class DocumentParser:
                     break
         
         # Extract tender reference
-        for pattern in reference_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for reference_re in self._reference_res:
+            match = reference_re.search(text)
             if match:
                 ref = match.group(1).strip()
                 if len(ref) > 2:
@@ -1,3 +1,7 @@
+import csv
+import io
+import re
+import numpy as np
 import pandas as pd
 from datetime import datetime, date
 from typing import Dict, List, Any
@@ -18,6 +22,45 @@ Building B2 Mivida Business Park 90 St. 5th Settlement • Cairo, Egypt
 +20100 0266 344 | +202 2322 8800
 hamada@aedco.com.eg
 www.aedco.com"""
+        
+        # Boilerplate shared by every quotation request, joined once
+        self._static_tail = "\n".join([
+            "**Please include in your quotation:**",
+            "• Detailed technical specifications",
+            "• Unit prices and total costs",
+            "• Delivery schedule and lead times",
+            "• Payment terms",
+            "• Validity period of the quotation",
+            "• Compliance certificates and quality documentation",
+            "• Country of origin for all materials",
+            "",
+            "We look forward to receiving your competitive quotation by the specified deadline. Should you have any questions or require clarification, please do not hesitate to contact us.",
+            "",
+            "Thank you for your time and consideration.",
+            "",
+            self.default_footer
+        ])
+        
+        # Follow-up email with {greeting}, {company_name} and {days_since_sent} placeholders
+        self._follow_up_template = "\n".join([
+            "{greeting}",
+            "",
+            "I hope this email finds you well.",
+            "",
+            "We sent a request for quotation to {company_name} {days_since_sent} days ago and have not yet received a response.",
+            "",
+            "We understand that you may be busy, but we would greatly appreciate your quotation for our project. The information is valuable to our procurement process.",
+            "",
+            "If you need additional time or have any questions regarding the requirements, please let us know. We are happy to extend the deadline or provide clarification as needed.",
+            "",
+            "If you are unable to provide a quotation for this project, please let us know so we can update our records accordingly.",
+            "",
+            "Thank you for your time and consideration. We look forward to hearing from you soon.",
+            "",
+            self.default_footer.replace("{", "{{").replace("}", "}}")
+        ])
+        
+        self._email_re = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', re.ASCII)
     
     def generate_emails(self, suppliers_df: pd.DataFrame, project_details: Dict[str, Any]) -> List[Dict[str, str]]:
         """
@@ -30,24 +73,24 @@ www.aedco.com"""
         Returns:
             List of dictionaries containing email data
         """
-        emails = []
-        
-        for _, supplier in suppliers_df.iterrows():
-            email_data = self._generate_single_email(supplier, project_details)
-            emails.append(email_data)
+        # Everything that depends only on the project is built once for all suppliers
+        project = self._prepare_project_details(project_details)
         
-        return emails
+        # Plain dicts avoid building a Series per row; both support .get()
+        return [
+            self._generate_single_email(supplier, project)
+            for supplier in suppliers_df.to_dict('records')
+        ]
     
-    def _generate_single_email(self, supplier: pd.Series, project_details: Dict[str, Any]) -> Dict[str, str]:
+    def _prepare_project_details(self, project_details: Dict[str, Any]) -> Dict[str, str]:
         """
-        Generate a single email draft for a supplier.
+        Build the subject line and the project section shared by every email of a project.
         
         Args:
-            supplier: Series containing supplier information
             project_details: Dictionary containing project information
             
         Returns:
-            Dictionary containing email data
+            Dictionary with 'subject' and 'project_section' strings
         """
         # Extract project details
         project_name = project_details.get('project_name', '')
@@ -69,17 +112,60 @@ www.aedco.com"""
         if tender_reference:
             subject += f" (Ref: {tender_reference})"
         
+        # Project details
+        section_parts = [f"**Project:** {project_name}"]
+        if tender_reference:
+            section_parts.append(f"**Reference:** {tender_reference}")
+        section_parts.extend([
+            f"**Quote Deadline:** {deadline_str}",
+            "",
+            "**Requirements and Specifications:**"
+        ])
+        
+        # Add requirements
+        if requirements:
+            # Split requirements into lines and format
+            req_lines = requirements.split('\n')
+            for line in req_lines:
+                if line.strip():
+                    section_parts.append(f"• {line.strip()}")
+        
+        section_parts.append("")
+        
+        # Additional notes
+        if additional_notes:
+            section_parts.extend([
+                "**Additional Information:**",
+                additional_notes,
+                ""
+            ])
+        
+        # Origin exclusion note
+        if include_note and exclude_origins:
+            origins_text = ", ".join(exclude_origins)
+            section_parts.extend([
+                f"**Please note:** For this project, we are specifically seeking suppliers from origins other than {origins_text}.",
+                ""
+            ])
+        
+        return {
+            'subject': subject,
+            'project_section': "\n".join(section_parts)
+        }
+    
+    def _generate_single_email(self, supplier: Dict[str, Any], project: Dict[str, str]) -> Dict[str, str]:
+        """
+        Generate a single email draft for a supplier.
+        
+        Args:
+            supplier: Supplier record (column name to value)
+            project: Prepared project details from _prepare_project_details
+            
+        Returns:
+            Dictionary containing email data
+        """
         # Generate email body
-        email_body = self._create_email_body(
-            supplier=supplier,
-            project_name=project_name,
-            tender_reference=tender_reference,
-            deadline_str=deadline_str,
-            requirements=requirements,
-            additional_notes=additional_notes,
-            exclude_origins=exclude_origins,
-            include_note=include_note
-        )
+        email_body = self._create_email_body(supplier, project['project_section'])
         
         return {
             'company_name': str(supplier.get('Company_Name', '') or ''),
@@ -87,26 +173,17 @@ www.aedco.com"""
             'email': str(supplier.get('Email', '') or ''),
             'country': str(supplier.get('Country', '') or ''),
             'materials': str(supplier.get('Material_Categories', '') or ''),
-            'subject': subject,
+            'subject': project['subject'],
             'email_body': email_body
         }
     
-    def _create_email_body(self, supplier: pd.Series, project_name: str, 
-                          tender_reference: str, deadline_str: str, requirements: str,
-                          additional_notes: str, exclude_origins: List[str], 
-                          include_note: bool) -> str:
+    def _create_email_body(self, supplier: Dict[str, Any], project_section: str) -> str:
         """
         Create the email body content.
         
         Args:
             supplier: Supplier information
-            project_name: Name of the project
-            tender_reference: Tender reference number
-            deadline_str: Formatted deadline string
-            requirements: Project requirements
-            additional_notes: Additional notes
-            exclude_origins: List of excluded origins
-            include_note: Whether to include origin exclusion note
+            project_section: Prebuilt project, requirements and notes section
             
         Returns:
             Formatted email body
@@ -132,61 +209,11 @@ www.aedco.com"""
             ""
         ])
         
-        # Project details
-        body_parts.append(f"**Project:** {project_name}")
-        if tender_reference:
-            body_parts.append(f"**Reference:** {tender_reference}")
-        body_parts.extend([
-            f"**Quote Deadline:** {deadline_str}",
-            "",
-            "**Requirements and Specifications:**"
-        ])
-        
-        # Add requirements
-        if requirements:
-            # Split requirements into lines and format
-            req_lines = requirements.split('\n')
-            for line in req_lines:
-                if line.strip():
-                    body_parts.append(f"• {line.strip()}")
-        
-        body_parts.append("")
-        
-        # Additional notes
-        if additional_notes:
-            body_parts.extend([
-                "**Additional Information:**",
-                additional_notes,
-                ""
-            ])
+        # Project details, requirements and notes
+        body_parts.append(project_section)
         
-        # Origin exclusion note
-        if include_note and exclude_origins:
-            origins_text = ", ".join(exclude_origins)
-            body_parts.extend([
-                f"**Please note:** For this project, we are specifically seeking suppliers from origins other than {origins_text}.",
-                ""
-            ])
-        
-        # Standard requirements
-        body_parts.extend([
-            "**Please include in your quotation:**",
-            "• Detailed technical specifications",
-            "• Unit prices and total costs",
-            "• Delivery schedule and lead times",
-            "• Payment terms",
-            "• Validity period of the quotation",
-            "• Compliance certificates and quality documentation",
-            "• Country of origin for all materials",
-            "",
-            "We look forward to receiving your competitive quotation by the specified deadline. Should you have any questions or require clarification, please do not hesitate to contact us.",
-            "",
-            "Thank you for your time and consideration.",
-            ""
-        ])
-        
-        # Add footer
-        body_parts.append(self.default_footer)
+        # Standard requirements and footer, identical for every supplier
+        body_parts.append(self._static_tail)
         
         return "\n".join(body_parts)
     
@@ -243,8 +270,16 @@ www.aedco.com"""
         Returns:
             CSV string
         """
-        df = pd.DataFrame(emails)
-        return df.to_csv(index=False)
+        if not emails:
+            return "\n"
+        
+        # Every email dict shares the same keys, so the rows are written directly
+        # without building a DataFrame; the dialect matches DataFrame.to_csv
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(emails[0].keys()), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(emails)
+        return buffer.getvalue()
     
     def validate_email_addresses(self, suppliers_df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -256,25 +291,24 @@ www.aedco.com"""
         Returns:
             DataFrame with validation results
         """
-        import re
-        
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        
-        validation_results = []
-        
-        for _, supplier in suppliers_df.iterrows():
-            email_raw = supplier.get('Email', '')
-            email = str(email_raw).strip() if email_raw and str(email_raw) != 'nan' else ''
-            is_valid = bool(re.match(email_pattern, email)) if email else False
-            
-            validation_results.append({
-                'Company_Name': supplier.get('Company_Name', ''),
-                'Email': email,
-                'Is_Valid': is_valid,
-                'Issue': 'Valid' if is_valid else ('Missing' if not email else 'Invalid format')
-            })
-        
-        return pd.DataFrame(validation_results)
+        empty = pd.Series('', index=suppliers_df.index, dtype=object)
+        emails = suppliers_df['Email'] if 'Email' in suppliers_df else empty
+        
+        # Missing values and the literal 'nan' count as no email
+        emails = emails.fillna('').astype(str)
+        emails = emails.where(emails != 'nan', '').str.strip()
+        
+        # The compiled ASCII pattern is mapped directly; Series.str.match rejects
+        # compiled patterns whose flags differ from its own defaults
+        is_valid = emails.map(self._email_re.match).notna()
+        issue = np.where(is_valid, 'Valid', np.where(emails == '', 'Missing', 'Invalid format'))
+        
+        return pd.DataFrame({
+            'Company_Name': suppliers_df['Company_Name'] if 'Company_Name' in suppliers_df else empty,
+            'Email': emails,
+            'Is_Valid': is_valid,
+            'Issue': issue
+        }).reset_index(drop=True)
     
     def create_follow_up_email(self, original_email_data: Dict[str, str], 
                               days_since_sent: int = 7) -> str:
@@ -296,22 +330,6 @@ www.aedco.com"""
         else:
             greeting = "Dear Sir/Madam,"
         
-        body_parts = [
-            greeting,
-            "",
-            f"I hope this email finds you well.",
-            "",
-            f"We sent a request for quotation to {company_name} {days_since_sent} days ago and have not yet received a response.",
-            "",
-            "We understand that you may be busy, but we would greatly appreciate your quotation for our project. The information is valuable to our procurement process.",
-            "",
-            "If you need additional time or have any questions regarding the requirements, please let us know. We are happy to extend the deadline or provide clarification as needed.",
-            "",
-            "If you are unable to provide a quotation for this project, please let us know so we can update our records accordingly.",
-            "",
-            "Thank you for your time and consideration. We look forward to hearing from you soon.",
-            "",
-            self.default_footer
-        ]
-        
-        return "\n".join(body_parts)
+        return self._follow_up_template.format(
+            greeting=greeting, company_name=company_name, days_since_sent=days_since_sent
+        )
@@ -3,22 +3,47 @@ Order Tracker Module for Hamada Tool
 Manages processed orders and follow-up tracking
 """
 
+import csv
 import pandas as pd
 import os
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, date
 from typing import Dict, List, Optional
 
+# Display names for supplier origins, keyed by lowercased country
+COUNTRY_DISPLAY_NAMES = {'china': 'Chinese', 'uae': 'Emirati'}
+
+# Free-text order columns, read as strings so references such as '00123' keep their zeros
+ORDER_TEXT_COLUMNS = (
+    'Order_ID', 'Project_Name', 'Tender_Reference', 'Date_Processed', 'Materials',
+    'Supplier_Categories', 'Status', 'Follow_Up_Date', 'Notes'
+)
+
+# Material keywords looked for in supplier specializations (lowercase)
+MATERIAL_KEYWORDS = ('piping', 'pipes', 'valves', 'flanges', 'fittings', 'bolts', 'gaskets', 'finned tubes')
+
 class OrderTracker:
     def __init__(self, data_file: str = 'data/processed_orders.csv'):
         """Initialize OrderTracker with data file path."""
         self.data_file = data_file
         self.orders_df = self._load_orders()
+        # Order_ID -> row positions in orders_df, for O(1) status updates
+        self._order_rows: Dict[str, List[int]] = {}
+        self._index_orders(0)
+        # Orders added since the last read, merged into orders_df on demand
+        self._pending: List[Dict] = []
+        # New orders not yet appended to the file, and whether an update needs a full rewrite
+        self._unwritten: List[Dict] = []
+        self._dirty = False
+        # Write after every change unless inside batch()
+        self._autoflush = True
     
     def _load_orders(self) -> pd.DataFrame:
         """Load processed orders from CSV file."""
         try:
             if os.path.exists(self.data_file):
-                return pd.read_csv(self.data_file)
+                return pd.read_csv(self.data_file, dtype=dict.fromkeys(ORDER_TEXT_COLUMNS, 'str'))
             else:
                 # Create empty DataFrame with required columns
                 return pd.DataFrame(columns=[
@@ -34,16 +59,75 @@ class OrderTracker:
                 'Status', 'Follow_Up_Date', 'Notes'
             ])
     
+    def _index_orders(self, start: int):
+        """Record the row positions of orders_df rows from start onwards."""
+        order_ids = self.orders_df['Order_ID'].to_numpy()[start:]
+        for position, order_id in enumerate(order_ids, start):
+            self._order_rows.setdefault(order_id, []).append(position)
+    
+    def _merge_pending(self):
+        """Fold buffered new orders into orders_df."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            start = len(self.orders_df)
+            self.orders_df = pd.concat([self.orders_df, pd.DataFrame(pending)], ignore_index=True)
+            self._index_orders(start)
+    
     def _save_orders(self) -> bool:
         """Save orders to CSV file."""
+        self._merge_pending()
         try:
             os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
             self.orders_df.to_csv(self.data_file, index=False)
+            self._unwritten = []
+            self._dirty = False
+            return True
+        except Exception as e:
+            print(f"Error saving orders: {e}")
+            return False
+    
+    def _append_orders(self, orders: List[Dict]) -> bool:
+        """Append order rows to the CSV file without rewriting it."""
+        try:
+            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+            write_header = not os.path.exists(self.data_file) or os.path.getsize(self.data_file) == 0
+            with open(self.data_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=list(orders[0].keys()), lineterminator='\n')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(orders)
             return True
         except Exception as e:
             print(f"Error saving orders: {e}")
             return False
     
+    def flush(self) -> bool:
+        """Write pending order changes to the CSV file."""
+        if self._dirty:
+            return self._save_orders()
+        if not self._unwritten:
+            return True
+        
+        # Append new rows; rewrite the file only if its columns differ
+        if list(self.orders_df.columns) != list(self._unwritten[0].keys()):
+            return self._save_orders()
+        orders, self._unwritten = self._unwritten, []
+        if self._append_orders(orders):
+            return True
+        self._unwritten = orders + self._unwritten
+        return False
+    
+    @contextmanager
+    def batch(self):
+        """Defer order writes inside the block and flush them once at the end."""
+        autoflush = self._autoflush
+        self._autoflush = False
+        try:
+            yield self
+        finally:
+            self._autoflush = autoflush
+            self.flush()
+    
     def add_processed_order(self, order_data: Dict) -> str:
         """Add a new processed order and return order ID."""
         order_id = f"ORD-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
@@ -62,57 +146,71 @@ class OrderTracker:
             'Notes': order_data.get('notes', '')
         }
         
-        # Add to DataFrame
-        new_row = pd.DataFrame([new_order])
-        self.orders_df = pd.concat([self.orders_df, new_row], ignore_index=True)
+        # Buffer the row instead of copying the whole DataFrame per insert
+        self._pending.append(new_order)
+        self._unwritten.append(new_order)
         
-        # Save to file
-        self._save_orders()
+        if self._autoflush:
+            self.flush()
         
         return order_id
     
     def get_orders(self) -> pd.DataFrame:
         """Get all processed orders."""
+        self._merge_pending()
+        # A real copy: without pandas 3's copy-on-write, update_order_status's in-place
+        # writes would show through a shallow copy already handed out
         return self.orders_df.copy()
     
     def update_order_status(self, order_id: str, status: str, notes: str = '') -> bool:
         """Update order status and notes."""
         try:
-            mask = self.orders_df['Order_ID'] == order_id
-            if mask.any():
-                self.orders_df.loc[mask, 'Status'] = status
+            self._merge_pending()
+            positions = self._order_rows.get(order_id)
+            if not positions:
+                return False
+            
+            # Positional writes skip the label alignment of a boolean-mask .loc
+            status_col = self.orders_df.columns.get_loc('Status')
+            notes_col = self.orders_df.columns.get_loc('Notes')
+            for position in positions:
+                self.orders_df.iat[position, status_col] = status
                 if notes:
-                    self.orders_df.loc[mask, 'Notes'] = notes
-                return self._save_orders()
-            return False
+                    self.orders_df.iat[position, notes_col] = notes
+            self._dirty = True
+            return self.flush() if self._autoflush else True
         except Exception as e:
             print(f"Error updating order: {e}")
             return False
     
     def get_pending_orders(self) -> pd.DataFrame:
         """Get orders that need follow-up."""
+        self._merge_pending()
         return self.orders_df[
             self.orders_df['Status'].isin(['Pending Response', 'Follow Up Required'])
-        ].copy()
+        ]
     
     def categorize_suppliers(self, emails: List[Dict]) -> str:
         """Categorize suppliers by country and materials."""
         categories = {}
         
-        for email in emails:
-            country = email.get('country', 'Unknown')
-            materials = email.get('materials', '')
-            
+        # Suppliers repeat the same country/materials pairs, so group them first
+        # and scan each distinct materials string only once
+        groups = Counter(
+            (email.get('country', 'Unknown'), email.get('materials', '')) for email in emails
+        )
+        
+        for (country, materials), count in groups.items():
             if country not in categories:
                 categories[country] = {'count': 0, 'materials': set()}
-            categories[country]['count'] += 1
+            categories[country]['count'] += count
             
             # Extract material keywords from supplier's specializations
             if materials:
-                material_keywords = ['piping', 'pipes', 'valves', 'flanges', 'fittings', 'bolts', 'gaskets', 'finned tubes']
-                for keyword in material_keywords:
-                    if keyword.lower() in materials.lower():
-                        categories[country]['materials'].add(keyword)
+                materials_lower = materials.lower()
+                categories[country]['materials'].update(
+                    keyword for keyword in MATERIAL_KEYWORDS if keyword in materials_lower
+                )
         
         # Create detailed category strings
         category_strings = []
@@ -120,12 +218,7 @@ class OrderTracker:
             count = data['count']
             materials = list(data['materials'])
             
-            if country.lower() == 'china':
-                country_name = "Chinese"
-            elif country.lower() == 'uae':
-                country_name = "Emirati"
-            else:
-                country_name = country
+            country_name = COUNTRY_DISPLAY_NAMES.get(country.lower(), country)
                 
             if materials:
                 material_text = ', '.join(sorted(materials))
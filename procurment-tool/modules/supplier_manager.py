@@ -1,18 +1,61 @@
+import re
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 import os
 from typing import Dict, List, Optional
 
+# Column dtypes applied at load time and restored after row edits widen them
+SUPPLIER_COLUMN_DTYPES = {'Country': 'category', 'Established_Year': 'Int16'}
+
+# European countries commonly found in oil & gas
+EUROPEAN_COUNTRIES = frozenset({
+    'Germany', 'France', 'Austria', 'Denmark', 'Finland',
+    'Italy', 'Netherlands', 'Norway', 'United Kingdom', 'Belgium'
+})
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _read_suppliers_csv(csv_file_path: str, file_stamp: Optional[tuple] = None) -> pd.DataFrame:
+    """Read the supplier CSV, cached across reruns until the file changes."""
+    # Use pyarrow's multi-threaded CSV reader
+    return pd.read_csv(csv_file_path, engine='pyarrow')
+
+def _contains(values: pd.Series, pattern: str, regex: bool) -> np.ndarray:
+    """Boolean mask of values containing pattern; missing values never match."""
+    # Arrow-backed strings go straight to the Arrow kernels, skipping pandas' str accessor
+    if isinstance(values.dtype, pd.StringDtype) and values.dtype.storage == 'pyarrow':
+        match = pc.match_substring_regex if regex else pc.match_substring
+        return match(pa.array(values), pattern).fill_null(False).to_numpy(zero_copy_only=False)
+    return values.str.contains(pattern, regex=regex, na=False).to_numpy(dtype=bool)
+
 class SupplierManager:
     """
     Manages the supplier database with CRUD operations.
     Handles CSV file operations and supplier filtering.
     """
     
-    def __init__(self, csv_file_path: str = "data/oil_gas_suppliers_consolidated.csv"):
+    def __init__(self, csv_file_path: str = "data/oil_gas_suppliers_consolidated.csv",
+                 flush_every: int = 1):
         self.csv_file_path = csv_file_path
+        self.flush_every = flush_every
         self.ensure_data_directory()
         self.load_initial_data()
+        
+        # Suppliers are held in memory; CRUD operations edit this frame instead of re-reading the CSV
+        self._df = self._read_suppliers()
+        self._pending_writes = 0
+        self._build_name_index()
+        
+        # Rows already on disk; pending additions alone are appended instead of rewriting the file
+        self._saved_rows = len(self._df)
+        self._rewrite_pending = False
+        
+        # Bumped on every change to self._df; keys the cached statistics and lowercased columns
+        self._version = 0
+        self._stats_cache = None
+        self._lower_cache = (self._version, {})
     
     def ensure_data_directory(self):
         """Ensure the data directory exists."""
@@ -32,14 +75,46 @@ class SupplierManager:
     
     def load_suppliers(self) -> pd.DataFrame:
         """
-        Load suppliers from CSV file.
+        Load suppliers from the in-memory table.
+        
+        Returns:
+            DataFrame containing supplier data (treat as read-only)
+        """
+        self._reload_if_changed()
+        return self._df
+    
+    def _file_stamp(self) -> Optional[tuple]:
+        """Modification time and size of the CSV file, or None if it does not exist."""
+        try:
+            stat = os.stat(self.csv_file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _reload_if_changed(self):
+        """Re-read the CSV if another manager wrote it since this one last read or saved it."""
+        # Unflushed changes (flush_every > 1) are kept rather than discarded
+        if self._pending_writes or self._file_stamp() == self._disk_stamp:
+            return
+        
+        self._df = self._read_suppliers()
+        self._build_name_index()
+        self._saved_rows = len(self._df)
+        self._rewrite_pending = False
+        self._version += 1
+    
+    def _read_suppliers(self) -> pd.DataFrame:
+        """
+        Read suppliers from CSV file.
         
         Returns:
             DataFrame containing supplier data
         """
+        # Stamped before reading, so a write racing the read triggers another reload
+        self._disk_stamp = self._file_stamp()
         try:
             if os.path.exists(self.csv_file_path):
-                df = pd.read_csv(self.csv_file_path)
+                df = _read_suppliers_csv(self.csv_file_path, self._disk_stamp)
                 # Ensure all required columns exist
                 required_columns = [
                     'Company_Name', 'Contact_Person', 'Email', 'Phone', 'Address',
@@ -50,6 +125,11 @@ class SupplierManager:
                     if col not in df.columns:
                         df[col] = ''
                 
+                # Categorical Country makes equality filters and counts run on integer codes,
+                # and typing the year once spares every statistics call a numeric coercion
+                df['Country'] = df['Country'].astype('category')
+                df['Established_Year'] = pd.to_numeric(df['Established_Year'], errors='coerce').astype('Int16')
+                
                 return df
             else:
                 # Return empty DataFrame with proper columns
@@ -65,23 +145,105 @@ class SupplierManager:
                 'Country', 'Specialization', 'Established_Year', 'Material_Categories'
             ])
     
-    def save_suppliers(self, df: pd.DataFrame) -> bool:
+    def save_suppliers(self, df: Optional[pd.DataFrame] = None) -> bool:
         """
         Save suppliers DataFrame to CSV file.
         
         Args:
-            df: DataFrame containing supplier data
+            df: DataFrame replacing the in-memory suppliers; the current table is saved if omitted
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            df.to_csv(self.csv_file_path, index=False)
+            if df is not None:
+                self._df = df
+                self._version += 1
+                self._build_name_index()
+            self._df.to_csv(self.csv_file_path, index=False)
+            _read_suppliers_csv.clear()
+            self._disk_stamp = self._file_stamp()
+            self._pending_writes = 0
+            self._saved_rows = len(self._df)
+            self._rewrite_pending = False
             return True
         except Exception as e:
             st.error(f"Error saving suppliers: {str(e)}")
             return False
     
+    def _append_new_suppliers(self) -> bool:
+        """
+        Append suppliers added since the last save to the CSV file.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            # Fall back to a full rewrite unless the file ends cleanly with the same header
+            with open(self.csv_file_path, 'rb') as f:
+                header = f.readline().decode('utf-8').rstrip('\r\n')
+                f.seek(-1, os.SEEK_END)
+                ends_with_newline = f.read(1) == b'\n'
+            if not ends_with_newline or header != ','.join(self._df.columns):
+                return self.save_suppliers()
+            
+            self._df.iloc[self._saved_rows:].to_csv(
+                self.csv_file_path, mode='a', header=False, index=False
+            )
+            _read_suppliers_csv.clear()
+            self._disk_stamp = self._file_stamp()
+            self._pending_writes = 0
+            self._saved_rows = len(self._df)
+            return True
+        except Exception as e:
+            st.error(f"Error saving suppliers: {str(e)}")
+            return False
+    
+    def _build_name_index(self):
+        """Map each company name to its row positions in the in-memory table."""
+        self._name_rows = {}
+        for position, name in enumerate(self._df['Company_Name'].to_numpy()):
+            self._name_rows.setdefault(name, []).append(position)
+    
+    def _lowercase_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """Return df[column] lowercased, reusing the cached copy for the managed table."""
+        if df is not self._df:
+            return df[column].str.lower()
+        
+        if self._lower_cache[0] != self._version:
+            self._lower_cache = (self._version, {})
+        cached = self._lower_cache[1]
+        if column not in cached:
+            cached[column] = df[column].str.lower()
+        return cached[column]
+    
+    def flush(self) -> bool:
+        """
+        Write pending supplier changes to the CSV file.
+        
+        Returns:
+            True if successful or nothing was pending, False otherwise
+        """
+        if not self._pending_writes:
+            return True
+        if self._rewrite_pending or not os.path.exists(self.csv_file_path):
+            return self.save_suppliers()
+        return self._append_new_suppliers()
+    
+    def _record_change(self, rewrite: bool = True) -> bool:
+        """Count a mutation and flush once flush_every changes are pending."""
+        # Row edits widen the typed columns; restore them for fast filters
+        for column, dtype in SUPPLIER_COLUMN_DTYPES.items():
+            if self._df[column].dtype != dtype:
+                self._df[column] = self._df[column].astype(dtype)
+        
+        self._version += 1
+        self._pending_writes += 1
+        self._rewrite_pending = self._rewrite_pending or rewrite
+        if self._pending_writes >= self.flush_every:
+            return self.flush()
+        return True
+    
     def add_supplier(self, supplier_data: Dict) -> bool:
         """
         Add a new supplier to the database.
@@ -93,17 +255,20 @@ class SupplierManager:
             True if successful, False otherwise
         """
         try:
-            df = self.load_suppliers()
+            self._reload_if_changed()
+            df = self._df
             
             # Check if company already exists
-            if not df.empty and supplier_data['Company_Name'] in df['Company_Name'].values:
+            company_name = supplier_data['Company_Name']
+            if company_name in self._name_rows:
                 return False
             
-            # Add new supplier
-            new_row = pd.DataFrame([supplier_data])
-            df = pd.concat([df, new_row], ignore_index=True)
+            # Add new supplier in place rather than concatenating a copy of the frame
+            position = len(df)
+            df.loc[position] = supplier_data
+            self._name_rows[company_name] = [position]
             
-            return self.save_suppliers(df)
+            return self._record_change(rewrite=False)
         
         except Exception as e:
             st.error(f"Error adding supplier: {str(e)}")
@@ -121,17 +286,30 @@ class SupplierManager:
             True if successful, False otherwise
         """
         try:
-            df = self.load_suppliers()
+            self._reload_if_changed()
+            df = self._df
             
-            if df.empty or company_name not in df['Company_Name'].values:
+            positions = self._name_rows.get(company_name)
+            if positions is None:
                 return False
             
-            # Update the supplier
-            mask = df['Company_Name'] == company_name
+            # Update the supplier's rows by position
             for key, value in updated_data.items():
-                df.loc[mask, key] = value
+                if key not in df.columns:
+                    df.loc[df.index[positions], key] = value
+                    continue
+                if isinstance(df[key].dtype, pd.CategoricalDtype):
+                    # Allow values outside the loaded categories (e.g. a new country)
+                    df[key] = df[key].astype(object)
+                column = df.columns.get_loc(key)
+                for position in positions:
+                    df.iat[position, column] = value
+            
+            new_name = updated_data.get('Company_Name', company_name)
+            if new_name != company_name:
+                self._name_rows.setdefault(new_name, []).extend(self._name_rows.pop(company_name))
             
-            return self.save_suppliers(df)
+            return self._record_change()
         
         except Exception as e:
             st.error(f"Error updating supplier: {str(e)}")
@@ -148,15 +326,22 @@ class SupplierManager:
             True if successful, False otherwise
         """
         try:
-            df = self.load_suppliers()
+            self._reload_if_changed()
+            df = self._df
             
-            if df.empty or company_name not in df['Company_Name'].values:
+            positions = self._name_rows.get(company_name)
+            if positions is None:
                 return False
             
-            # Remove the supplier
-            df = df[df['Company_Name'] != company_name]
+            # Remove the supplier, keeping a contiguous index for in-place appends
+            df.drop(df.index[positions], inplace=True)
+            df.reset_index(drop=True, inplace=True)
+            # Don't keep listing a country whose last supplier was just deleted
+            if isinstance(df['Country'].dtype, pd.CategoricalDtype):
+                df['Country'] = df['Country'].cat.remove_unused_categories()
+            self._build_name_index()
             
-            return self.save_suppliers(df)
+            return self._record_change()
         
         except Exception as e:
             st.error(f"Error deleting supplier: {str(e)}")
@@ -179,25 +364,22 @@ class SupplierManager:
             if df.empty:
                 return df
             
-            filtered_df = df.copy()
+            # Both filters are combined into one mask so the frame is indexed only once
+            mask = None
             
-            # Filter by material categories
+            # Filter by material categories in a single scan over an alternation of all categories
             if material_categories:
-                category_mask = pd.Series([False] * len(filtered_df))
-                
-                for category in material_categories:
-                    category_mask |= filtered_df['Material_Categories'].str.contains(
-                        category, case=False, na=False
-                    )
-                
-                filtered_df = filtered_df[category_mask]
+                pattern = '|'.join(re.escape(category.lower()) for category in material_categories)
+                mask = _contains(
+                    self._lowercase_column(df, 'Material_Categories'), pattern, regex=True
+                )
             
             # Exclude specified origins
             if exclude_origins:
-                for origin in exclude_origins:
-                    filtered_df = filtered_df[filtered_df['Country'] != origin]
+                origin_mask = ~df['Country'].isin(exclude_origins).to_numpy()
+                mask = origin_mask if mask is None else mask & origin_mask
             
-            return filtered_df
+            return df if mask is None else df[mask]
         
         except Exception as e:
             st.error(f"Error filtering suppliers: {str(e)}")
@@ -239,7 +421,8 @@ class SupplierManager:
             if df.empty:
                 return df
             
-            return df[df['Material_Categories'].str.contains(material, case=False, na=False)]
+            materials = self._lowercase_column(df, 'Material_Categories')
+            return df[_contains(materials, material.lower(), regex=False)]
         
         except Exception as e:
             st.error(f"Error filtering by material: {str(e)}")
@@ -260,9 +443,20 @@ class SupplierManager:
             if df.empty or not search_term.strip():
                 return df
             
-            search_mask = (
-                df['Company_Name'].str.contains(search_term, case=False, na=False) |
-                df['Specialization'].str.contains(search_term, case=False, na=False)
+            # A plain substring scan over the raw values beats two pandas str.contains
+            # dispatches on supplier lists of this size
+            term = search_term.lower()
+            search_mask = np.fromiter(
+                (
+                    (isinstance(name, str) and term in name) or
+                    (isinstance(specialization, str) and term in specialization)
+                    for name, specialization in zip(
+                        self._lowercase_column(df, 'Company_Name').to_numpy(dtype=object),
+                        self._lowercase_column(df, 'Specialization').to_numpy(dtype=object)
+                    )
+                ),
+                dtype=bool,
+                count=len(df)
             )
             
             return df[search_mask]
@@ -292,22 +486,27 @@ class SupplierManager:
                     'recent_suppliers': 0
                 }
             
-            # Define European countries commonly found in oil & gas
-            european_countries = [
-                'Germany', 'France', 'Austria', 'Denmark', 'Finland', 
-                'Italy', 'Netherlands', 'Norway', 'United Kingdom', 'Belgium'
-            ]
+            # Statistics of the managed table only change when it is mutated
+            if df is self._df and self._stats_cache and self._stats_cache[0] == self._version:
+                return dict(self._stats_cache[1])
+            
+            # One pass over Country serves every per-country figure
+            country_counts = df['Country'].value_counts()
+            country_counts = country_counts[country_counts > 0]
             
             stats = {
                 'total_suppliers': len(df),
-                'total_countries': df['Country'].nunique(),
-                'chinese_suppliers': len(df[df['Country'] == 'China']),
-                'emirati_suppliers': len(df[df['Country'] == 'UAE']),
-                'european_suppliers': len(df[df['Country'].isin(european_countries)]),
-                'recent_suppliers': len(df[pd.to_numeric(df['Established_Year'], errors='coerce') >= 2020])
+                'total_countries': len(country_counts),
+                'chinese_suppliers': int(country_counts.get('China', 0)),
+                'emirati_suppliers': int(country_counts.get('UAE', 0)),
+                'european_suppliers': int(country_counts[country_counts.index.isin(EUROPEAN_COUNTRIES)].sum()),
+                'recent_suppliers': int((df['Established_Year'] >= 2020).sum())
             }
             
-            return stats
+            if df is self._df:
+                self._stats_cache = (self._version, stats)
+            
+            return dict(stats)
         
         except Exception as e:
             st.error(f"Error calculating statistics: {str(e)}")
@@ -15,6 +15,7 @@ CREATE TABLE IF NOT EXISTS user_activities (
 CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp ON user_activities(timestamp);
 CREATE INDEX IF NOT EXISTS idx_user_activities_type ON user_activities(activity_type);
 CREATE INDEX IF NOT EXISTS idx_user_activities_user_id ON user_activities(user_id);
+CREATE INDEX IF NOT EXISTS idx_user_activities_data ON user_activities USING GIN (data jsonb_path_ops);
 
 -- Create terms_acceptance table for tracking terms acceptance
 CREATE TABLE IF NOT EXISTS terms_acceptance (
@@ -116,6 +117,82 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- Create function to aggregate activity counts for the dashboard
+-- (sampled rows count as data->>'sampled_count' events)
+CREATE OR REPLACE FUNCTION activity_stats()
+RETURNS TABLE (
+    activity_type VARCHAR(100),
+    cnt BIGINT,
+    last_ts TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        ua.activity_type,
+        SUM(COALESCE((ua.data->>'sampled_count')::BIGINT, 1))::BIGINT as cnt,
+        MAX(ua.timestamp) as last_ts
+    FROM user_activities ua
+    GROUP BY ua.activity_type;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- Create function for test_connection.py: inserts a test activity, reads it back
+-- and deletes it again in a single round trip (runs as owner so cleanup bypasses RLS)
+CREATE OR REPLACE FUNCTION connection_selftest(payload JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    test_id BIGINT;
+    found_count INTEGER;
+BEGIN
+    INSERT INTO user_activities (activity_type, data, user_id)
+    VALUES ('connection_test', payload, 'test_user')
+    RETURNING id INTO test_id;
+
+    SELECT COUNT(*) INTO found_count
+    FROM user_activities ua
+    WHERE ua.id = test_id;
+
+    DELETE FROM user_activities ua WHERE ua.id = test_id;
+
+    RETURN found_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Batched variant for test_connection.py --batch N: inserts one test activity per payload
+-- in a single statement, counts and deletes them, and reports the server-side insert time
+CREATE OR REPLACE FUNCTION connection_selftest_batch(payloads JSONB)
+RETURNS TABLE (
+    inserted_count INTEGER,
+    found_count INTEGER,
+    deleted_count INTEGER,
+    insert_ms DOUBLE PRECISION
+) AS $$
+DECLARE
+    started_at TIMESTAMPTZ;
+    test_ids BIGINT[];
+BEGIN
+    started_at := clock_timestamp();
+    WITH inserted AS (
+        INSERT INTO user_activities (activity_type, data, user_id)
+        SELECT 'connection_test', payload.value, 'test_user'
+        FROM jsonb_array_elements(payloads) AS payload
+        RETURNING user_activities.id
+    )
+    SELECT array_agg(inserted.id) INTO test_ids FROM inserted;
+    insert_ms := EXTRACT(EPOCH FROM clock_timestamp() - started_at) * 1000;
+    inserted_count := COALESCE(cardinality(test_ids), 0);
+
+    SELECT COUNT(*) INTO found_count
+    FROM user_activities ua
+    WHERE ua.id = ANY(test_ids);
+
+    DELETE FROM user_activities ua WHERE ua.id = ANY(test_ids);
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
 -- Insert sample data for testing (optional)
 -- INSERT INTO user_activities (activity_type, data, user_id) VALUES 
 -- ('document_processed', '{"file_name": "sample.pdf", "extracted_deadlines": 2}', 'test_user'),
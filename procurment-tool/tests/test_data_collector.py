@@ -0,0 +1,90 @@
+import gc
+import threading
+
+import httpx
+from supabase import ClientOptions, create_client
+
+from modules import data_collector
+from modules.data_collector import DataCollector
+
+
+def test_collectors_share_one_flusher_thread():
+    """A collector per session must not start a thread per session."""
+    DataCollector()
+    threads_before = threading.active_count()
+    
+    collectors = [DataCollector() for _ in range(5)]
+    
+    assert all(collector.connected for collector in collectors)
+    assert threading.active_count() == threads_before
+
+
+def test_dropped_collector_leaves_queued_rows_to_the_flusher(monkeypatch):
+    inserted = []
+    monkeypatch.setattr(data_collector, '_insert_activities', lambda supabase, batch: inserted.extend(batch))
+    
+    collector = DataCollector(flush_interval=3600)
+    collector.log_user_activity('document_processed', {'file': 'rfq.pdf'})
+    del collector
+    gc.collect()
+    
+    assert not any(c.flush_interval == 3600 for c in data_collector._collectors)
+    data_collector._flush_all()
+    assert [row['data'] for row in inserted] == [{'file': 'rfq.pdf'}]
+
+
+def _recorded_weight(rows, activity_type):
+    return sum(row['data'].get('sampled_count', 1) for row in rows if row['activity_type'] == activity_type)
+
+
+def test_sampled_weight_matches_real_event_count_across_sessions(monkeypatch):
+    """Sampling must not inflate short sessions: 100 sessions x 3 searches weigh 300."""
+    inserted = []
+    monkeypatch.setattr(data_collector, '_insert_activities', lambda supabase, batch: inserted.extend(batch))
+    
+    for _ in range(100):
+        collector = DataCollector(flush_interval=3600)
+        for _ in range(3):
+            collector.log_supplier_search({'materials': ['valves']}, 5)
+        del collector
+    gc.collect()
+    data_collector._flush_all()
+    
+    assert _recorded_weight(inserted, 'supplier_searched') == 300
+
+
+def test_full_flush_writes_the_sampling_residual(monkeypatch):
+    inserted = []
+    monkeypatch.setattr(data_collector, '_insert_activities', lambda supabase, batch: inserted.extend(batch))
+    
+    collector = DataCollector(flush_interval=3600)
+    for _ in range(25):
+        collector.log_supplier_search({'materials': ['valves']}, 5)
+    collector.flush(include_residuals=True)
+    
+    assert _recorded_weight(inserted, 'supplier_searched') == 25
+    assert sum(row['activity_type'] == 'supplier_searched' for row in inserted) == 3
+
+
+def test_usage_statistics_fall_back_when_activity_stats_is_missing():
+    """Un-migrated databases (no activity_stats function) are counted client-side."""
+    def handler(request):
+        if request.url.path.endswith('/rpc/activity_stats'):
+            return httpx.Response(404, json={'code': 'PGRST202', 'message': 'Could not find the function',
+                                             'details': None, 'hint': None})
+        return httpx.Response(200, json=[
+            {'activity_type': 'supplier_searched', 'timestamp': '2026-10-01T10:00:00+00:00', 'sampled_count': 10},
+            {'activity_type': 'supplier_searched', 'timestamp': '2026-10-02T10:00:00+00:00', 'sampled_count': None},
+            {'activity_type': 'email_generated', 'timestamp': '2026-09-30T10:00:00+00:00', 'sampled_count': None},
+        ])
+    
+    options = ClientOptions(httpx_client=httpx.Client(transport=httpx.MockTransport(handler)))
+    supabase = create_client('https://example.supabase.co', 'anon-key', options=options)
+    
+    stats = data_collector._fetch_usage_statistics.__wrapped__(supabase)
+    
+    assert stats == {
+        'total_activities': 12,
+        'activity_breakdown': {'supplier_searched': 11, 'email_generated': 1},
+        'last_activity': '2026-10-02T10:00:00+00:00'
+    }
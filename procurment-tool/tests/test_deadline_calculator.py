@@ -0,0 +1,22 @@
+from datetime import date
+
+import pytest
+
+from modules.deadline_calculator import DeadlineCalculator
+
+TODAY = date(2026, 10, 15)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # An ISO date is read whole, not as the short day/month/year '27-01-30' inside it
+    ("Deadline: 2027-01-30", date(2027, 1, 30)),
+    # Digits consumed by a month-name date are not re-read as a numeric date
+    ("March 3, 2029.01.02", date(2029, 3, 3)),
+    ("Submit by 15/02/2027", date(2027, 2, 15)),
+    ("Due: December 1, 2027", date(2027, 12, 1)),
+])
+def test_extract_deadline_from_text(text, expected):
+    calculator = DeadlineCalculator()
+    
+    assert calculator.extract_deadline_from_text(text, today=TODAY) == expected
+    assert calculator.extract_deadlines_batch([text], today=TODAY) == [expected]
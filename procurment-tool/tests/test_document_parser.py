@@ -0,0 +1,17 @@
+from datetime import date
+
+from modules.document_parser import DocumentParser
+
+
+def test_deadline_keyword_beats_earlier_date_before_deadline():
+    """A 'Deadline:' date wins even when an earlier date sits right before the keyword."""
+    text = "Bid opening 10/01/2027\nDeadline: 15/01/2027"
+    
+    assert DocumentParser()._extract_deadline(text) == date(2027, 1, 15)
+
+
+def test_deadline_falls_back_to_date_followed_by_deadline():
+    """Without a higher-priority pattern, the date before 'deadline' is used."""
+    text = "Bid opening 10/01/2027 deadline"
+    
+    assert DocumentParser()._extract_deadline(text) == date(2027, 10, 1)
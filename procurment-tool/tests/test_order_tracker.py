@@ -0,0 +1,12 @@
+from modules.order_tracker import OrderTracker
+
+
+def test_get_orders_is_not_changed_by_later_status_updates(tmp_path):
+    tracker = OrderTracker(str(tmp_path / "orders.csv"))
+    order_id = tracker.add_processed_order({'project_name': 'Pipeline Upgrade', 'materials': ['valves']})
+    
+    orders = tracker.get_orders()
+    assert tracker.update_order_status(order_id, 'Follow Up Completed')
+    
+    assert orders['Status'].tolist() == ['Pending Response']
+    assert tracker.get_orders()['Status'].tolist() == ['Follow Up Completed']
@@ -0,0 +1,54 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+from modules.supplier_manager import SupplierManager
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "suppliers.csv"
+    shutil.copy("data/oil_gas_suppliers_consolidated.csv", path)
+    return str(path)
+
+
+def _supplier(name: str, country: str = "Germany") -> dict:
+    return {
+        'Company_Name': name, 'Contact_Person': 'Jane Doe', 'Email': 'jane@example.com',
+        'Phone': '+49 1', 'Address': 'Berlin', 'Country': country,
+        'Specialization': 'Valves', 'Established_Year': 2021, 'Material_Categories': 'valves'
+    }
+
+
+def test_update_does_not_drop_rows_added_by_another_manager(csv_path):
+    """A manager with a stale table re-reads the CSV before rewriting it."""
+    first, second = SupplierManager(csv_path), SupplierManager(csv_path)
+    existing = second.load_suppliers()['Company_Name'].iloc[0]
+    
+    assert first.add_supplier(_supplier("Added Elsewhere GmbH"))
+    assert second.update_supplier(existing, {'Contact_Person': 'New Contact'})
+    
+    saved = pd.read_csv(csv_path)
+    assert "Added Elsewhere GmbH" in set(saved['Company_Name'])
+    assert saved.loc[saved['Company_Name'] == existing, 'Contact_Person'].iloc[0] == 'New Contact'
+
+
+def test_load_suppliers_picks_up_changes_from_another_manager(csv_path):
+    first, second = SupplierManager(csv_path), SupplierManager(csv_path)
+    second.load_suppliers()
+    
+    assert first.add_supplier(_supplier("Added Elsewhere GmbH"))
+    
+    assert "Added Elsewhere GmbH" in set(second.load_suppliers()['Company_Name'])
+
+
+def test_deleting_last_supplier_of_a_country_drops_the_country(csv_path):
+    manager = SupplierManager(csv_path)
+    assert manager.add_supplier(_supplier("Only Supplier Ltd", country="Atlantis"))
+    
+    assert manager.delete_supplier("Only Supplier Ltd")
+    
+    suppliers = manager.load_suppliers()
+    assert "Atlantis" not in suppliers['Country'].cat.categories
+    assert "Atlantis" not in suppliers['Country'].value_counts().index
@@ -0,0 +1,26 @@
+/*
+  # Activity statistics aggregate
+
+  1. New Functions
+    - `activity_stats()` - Activity count and latest timestamp per activity type,
+      so the dashboard no longer downloads every row of `user_activities`
+*/
+
+CREATE OR REPLACE FUNCTION activity_stats()
+RETURNS TABLE (
+    activity_type VARCHAR(100),
+    cnt BIGINT,
+    last_ts TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        ua.activity_type,
+        COUNT(*) as cnt,
+        MAX(ua.timestamp) as last_ts
+    FROM user_activities ua
+    GROUP BY ua.activity_type;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+GRANT EXECUTE ON FUNCTION activity_stats() TO anon;
@@ -0,0 +1,16 @@
+/*
+  # Store activity data as JSON objects
+
+  1. Data
+    - `user_activities.data` used to receive a JSON-encoded string, which JSONB
+      stored as a string scalar; unwrap those rows into real JSON objects
+
+  2. Indexes
+    - GIN index on `user_activities.data` for containment queries
+*/
+
+UPDATE user_activities
+SET data = (data #>> '{}')::jsonb
+WHERE jsonb_typeof(data) = 'string';
+
+CREATE INDEX IF NOT EXISTS idx_user_activities_data ON user_activities USING GIN (data jsonb_path_ops);
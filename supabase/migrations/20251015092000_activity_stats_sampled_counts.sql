@@ -0,0 +1,24 @@
+/*
+  # Count sampled activities at their full weight
+
+  1. Functions
+    - `activity_stats()` - A sampled activity row stands for `data->>'sampled_count'`
+      events, so counts add that weight instead of counting rows
+*/
+
+CREATE OR REPLACE FUNCTION activity_stats()
+RETURNS TABLE (
+    activity_type VARCHAR(100),
+    cnt BIGINT,
+    last_ts TIMESTAMPTZ
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        ua.activity_type,
+        SUM(COALESCE((ua.data->>'sampled_count')::BIGINT, 1))::BIGINT as cnt,
+        MAX(ua.timestamp) as last_ts
+    FROM user_activities ua
+    GROUP BY ua.activity_type;
+END;
+$$ LANGUAGE plpgsql STABLE;
@@ -0,0 +1,34 @@
+/*
+  # Connection self-test in one round trip
+
+  1. New Functions
+    - `connection_selftest(payload)` - Inserts a `connection_test` activity, reads it
+      back by id and deletes it again, returning how many rows were read back, so
+      `test_connection.py` needs a single request instead of insert, select and delete
+
+  2. Security
+    - Runs as the function owner: `user_activities` has no delete policy, so the
+      cleanup would otherwise be filtered out by RLS for the anon role
+*/
+
+CREATE OR REPLACE FUNCTION connection_selftest(payload JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+    test_id BIGINT;
+    found_count INTEGER;
+BEGIN
+    INSERT INTO user_activities (activity_type, data, user_id)
+    VALUES ('connection_test', payload, 'test_user')
+    RETURNING id INTO test_id;
+
+    SELECT COUNT(*) INTO found_count
+    FROM user_activities ua
+    WHERE ua.id = test_id;
+
+    DELETE FROM user_activities ua WHERE ua.id = test_id;
+
+    RETURN found_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION connection_selftest(JSONB) TO anon;
@@ -0,0 +1,48 @@
+/*
+  # Batched connection self-test
+
+  1. New Functions
+    - `connection_selftest_batch(payloads)` - Inserts one `connection_test` activity per
+      element of the `payloads` array in a single statement, counts them by id and
+      deletes them again. Returns the inserted, found and deleted counts and the
+      server-side insert time, for `test_connection.py --batch N`
+
+  2. Security
+    - Runs as the function owner: `user_activities` has no delete policy, so the
+      cleanup would otherwise be filtered out by RLS for the anon role
+*/
+
+CREATE OR REPLACE FUNCTION connection_selftest_batch(payloads JSONB)
+RETURNS TABLE (
+    inserted_count INTEGER,
+    found_count INTEGER,
+    deleted_count INTEGER,
+    insert_ms DOUBLE PRECISION
+) AS $$
+DECLARE
+    started_at TIMESTAMPTZ;
+    test_ids BIGINT[];
+BEGIN
+    started_at := clock_timestamp();
+    WITH inserted AS (
+        INSERT INTO user_activities (activity_type, data, user_id)
+        SELECT 'connection_test', payload.value, 'test_user'
+        FROM jsonb_array_elements(payloads) AS payload
+        RETURNING user_activities.id
+    )
+    SELECT array_agg(inserted.id) INTO test_ids FROM inserted;
+    insert_ms := EXTRACT(EPOCH FROM clock_timestamp() - started_at) * 1000;
+    inserted_count := COALESCE(cardinality(test_ids), 0);
+
+    SELECT COUNT(*) INTO found_count
+    FROM user_activities ua
+    WHERE ua.id = ANY(test_ids);
+
+    DELETE FROM user_activities ua WHERE ua.id = ANY(test_ids);
+    GET DIAGNOSTICS deleted_count = ROW_COUNT;
+
+    RETURN NEXT;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION connection_selftest_batch(JSONB) TO anon;